@@ -40,13 +40,13 @@ print_status "Dependencies installed"
 # Run unit tests
 echo ""
 echo "🧪 Running unit tests..."
-python3 test_wipeit.py -v
+python3 -m unittest discover -s . -p "test_*.py" -v
 print_status "Unit tests passed"
 
 # Run tests with coverage
 echo ""
 echo "📊 Running coverage analysis..."
-coverage run test_wipeit.py
+coverage run -m unittest discover -s . -p "test_*.py"
 coverage report --show-missing
 print_status "Coverage analysis completed"
 
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+ChunkProducer class for wipeit - Secure device wiping utility.
+
+Generates the next chunk of random data on a background thread while the
+current chunk is being written. os.urandom() and os.pwrite() both release
+the GIL while in the kernel, so generation and the kernel write path
+overlap and each chunk costs roughly max(generate, write) instead of
+generate + write.
+
+Chunks are generated into two reused page-aligned buffers, so the loop
+does not allocate a new chunk-sized object per iteration and O_DIRECT
+writes can go straight from them.
+"""
+
+import mmap
+import os
+import queue
+import threading
+
+from global_constants import RANDOM_BLOCK_SIZE
+
+
+class ChunkProducer:
+    """
+    Single-thread random chunk prefetcher.
+
+    The consumer asks for a chunk with request(size) and collects it with
+    take(). Requesting the next chunk before writing the current one keeps
+    exactly one chunk generating in the background. Use as a context
+    manager so the thread is stopped on errors and KeyboardInterrupt.
+
+    Chunks are memoryviews into two alternating buffers, so a chunk is
+    only valid until the request after next is made: request at most one
+    chunk ahead of the chunk being written.
+    """
+
+    def __init__(self, max_size):
+        """
+        Initialize chunk producer.
+
+        Args:
+            max_size: Largest chunk that will be requested, in bytes
+        """
+        self.max_size = max_size
+        # Both buffers are allocated once; anonymous mmaps are
+        # page-aligned, as O_DIRECT requires, and only commit memory for
+        # pages actually filled
+        self._buffers = [mmap.mmap(-1, max_size), mmap.mmap(-1, max_size)]
+        self._next_buffer = 0
+        self._requests = queue.Queue()
+        self._chunks = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        """Generate one chunk per request until close() sends None."""
+        while True:
+            size = self._requests.get()
+            if size is None:
+                return
+            try:
+                self._chunks.put(self._fill_buffer(size))
+            except Exception as e:
+                self._chunks.put(e)
+
+    def _fill_buffer(self, size):
+        """
+        Fill the next buffer in rotation with size random bytes.
+
+        Args:
+            size: Number of random bytes
+
+        Returns:
+            memoryview: The first size bytes of the buffer
+
+        Raises:
+            ValueError: If size is larger than max_size
+        """
+        if size > self.max_size:
+            raise ValueError(f"Chunk of {size} bytes exceeds buffer size "
+                             f"{self.max_size}")
+        index = self._next_buffer
+        self._next_buffer ^= 1
+        chunk = memoryview(self._buffers[index])[:size]
+        # Kernel CSPRNG, one RANDOM_BLOCK_SIZE slice at a time, so only a
+        # small temporary bytes object exists besides the buffer
+        for start in range(0, size, RANDOM_BLOCK_SIZE):
+            block = chunk[start:start + RANDOM_BLOCK_SIZE]
+            block[:] = os.urandom(len(block))
+        return chunk
+
+    def request(self, size):
+        """
+        Start generating a chunk of size bytes.
+
+        Args:
+            size: Number of random bytes for the chunk
+        """
+        self._requests.put(size)
+
+    def take(self):
+        """
+        Return the oldest requested chunk, waiting until it is ready.
+
+        Returns:
+            memoryview: Random chunk in a reused buffer
+
+        Raises:
+            Exception: Any error raised while generating the chunk
+        """
+        chunk = self._chunks.get()
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def close(self):
+        """Stop the producer thread."""
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join()
@@ -8,10 +8,29 @@ detection and information gathering functionality.
 
 import fcntl
 import os
+import re
+import stat
 import struct
 import subprocess
 
-from global_constants import BLKGETSIZE64, GIGABYTE
+from global_constants import (
+    BLKGETSIZE64,
+    GIGABYTE,
+    MOUNTINFO_PATH,
+    SWAPS_PATH,
+    SYSFS_BLOCK_DIR,
+    SYSFS_DEV_BLOCK_DIR,
+    SYSFS_SECTOR_SIZE,
+    UDEV_DATA_DIR,
+)
+
+# Octal escapes (\040 for a space etc.) used in mountinfo and swaps paths
+_MOUNTINFO_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+
+def _unescape(path):
+    """Decode the octal escapes the kernel uses in /proc path fields."""
+    return _MOUNTINFO_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), path)
 
 
 class DeviceDetector:
@@ -35,7 +54,7 @@ class DeviceDetector:
 
     def get_size(self):
         """
-        Get device size in bytes using BLKGETSIZE64 ioctl.
+        Get device size in bytes from sysfs, or the BLKGETSIZE64 ioctl.
 
         Returns:
             int: Device size in bytes
@@ -50,12 +69,11 @@ class DeviceDetector:
     @staticmethod
     def get_block_device_size(device: str) -> int:
         """
-        Get the size of a block device in bytes using the BLKGETSIZE64 ioctl.
+        Get the size of a block device in bytes.
 
-        This function directly queries the Linux kernel for the device size
-        using the BLKGETSIZE64 ioctl command, which returns the device size
-        as a 64-bit unsigned integer. This is more reliable than parsing
-        /proc or /sys files.
+        Reads the sector count from /sys/dev/block/<major>:<minor>/size,
+        which needs neither an open descriptor on the device nor root.
+        Falls back to the BLKGETSIZE64 ioctl if sysfs has no entry.
 
         Args:
             device (str): Path to the block device
@@ -69,26 +87,108 @@ class DeviceDetector:
             PermissionError: If insufficient permissions to access the device
             OSError: If the ioctl call fails (e.g., not a block device)
         """
-        with open(device, 'rb') as fd:
+        try:
+            st = os.stat(device)
+            if stat.S_ISBLK(st.st_mode):
+                size_path = os.path.join(
+                    SYSFS_DEV_BLOCK_DIR,
+                    f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}", 'size')
+                with open(size_path, 'r') as f:
+                    return int(f.read().strip()) * SYSFS_SECTOR_SIZE
+        except (OSError, ValueError):
+            pass
+
+        fd = os.open(device, os.O_RDONLY | os.O_CLOEXEC)
+        try:
             buf = bytearray(8)
-            fcntl.ioctl(fd.fileno(), BLKGETSIZE64, buf)
+            fcntl.ioctl(fd, BLKGETSIZE64, buf)
             return struct.unpack('Q', buf)[0]
+        finally:
+            os.close(fd)
+
+    def get_optimal_io_size(self):
+        """
+        Get the device's preferred I/O size from sysfs.
+
+        Returns:
+            int: optimal_io_size in bytes, or 0 if the device does not
+                 report one
+        """
+        try:
+            return int(self._read_queue_attribute('optimal_io_size'))
+        except (TypeError, ValueError):
+            return 0
+
+    def _read_queue_attribute(self, attribute):
+        """
+        Read a /sys/block/<name>/queue attribute once per detector.
+
+        Args:
+            attribute: File name under the queue directory
+                       (e.g. 'rotational')
+
+        Returns:
+            str: Stripped file contents, or None if it cannot be read
+        """
+        key = ('queue', attribute)
+        if key not in self._cached_info:
+            path = f"/sys/block/{self.device_name}/queue/{attribute}"
+            try:
+                with open(path, 'r') as f:
+                    self._cached_info[key] = f.read().strip()
+            except OSError:
+                self._cached_info[key] = None
+        return self._cached_info[key]
 
     def get_device_properties(self):
         """
-        Get device properties from udevadm.
+        Get device properties from udev.
+
+        Reads the udev database directly and only runs udevadm when the
+        database entry is unavailable. The result is cached, since
+        display_info() and detect_type() both need it.
 
         Returns:
             dict: Device properties (model, serial, etc.)
         """
+        if 'properties' not in self._cached_info:
+            self._cached_info['properties'] = (self._read_udev_database() or
+                                               self._query_udevadm())
+        return self._cached_info['properties']
+
+    def _read_udev_database(self):
+        """
+        Read device properties from the udev database file.
+
+        Returns:
+            dict: Properties from the E: lines, or {} if unavailable
+        """
+        try:
+            st = os.stat(self.device_path)
+            if not stat.S_ISBLK(st.st_mode):
+                return {}
+            path = os.path.join(UDEV_DATA_DIR, f"b{os.major(st.st_rdev)}:"
+                                               f"{os.minor(st.st_rdev)}")
+            with open(path, 'r') as f:
+                return dict(line[2:].rstrip('\n').split('=', 1)
+                            for line in f
+                            if line.startswith('E:') and '=' in line)
+        except OSError:
+            return {}
+
+    def _query_udevadm(self):
+        """
+        Get device properties by running udevadm.
+
+        Returns:
+            dict: Device properties, or {} if udevadm fails
+        """
         try:
             cmd = ['udevadm', 'info', '--query=property', '--name',
                    self.device_path]
-            model = subprocess.check_output(cmd).decode()
-            lines = model.splitlines()
-            info = {line.split('=')[0]: line.split('=')[1]
-                    for line in lines if '=' in line}
-            return info
+            output = subprocess.check_output(cmd).decode()
+            return dict(line.split('=', 1)
+                        for line in output.splitlines() if '=' in line)
         except Exception:
             return {}
 
@@ -137,11 +237,10 @@ class DeviceDetector:
 
     def _check_rotational(self):
         """Check if device is rotational via sysfs."""
-        rotational_path = f"/sys/block/{self.device_name}/queue/rotational"
-        if os.path.exists(rotational_path):
-            with open(rotational_path, 'r') as f:
-                return f.read().strip() == '1'
-        return None
+        rotational = self._read_queue_attribute('rotational')
+        if rotational is None:
+            return None
+        return rotational == '1'
 
     def _check_nvme_interface(self):
         """Check if device uses NVMe interface."""
@@ -202,47 +301,207 @@ class DeviceDetector:
 
     def is_mounted(self):
         """
-        Check if device or partitions are mounted.
+        Check if device, partitions or devices stacked on them are in use.
+
+        Reads the kernel mount table and swap list directly. Mounts are
+        matched by device number, or by mount source for filesystems such
+        as btrfs that report an anonymous device number. Holders (LUKS,
+        LVM, md) of the device and its partitions are checked too.
+
+        If the check itself fails, the device is reported as mounted so
+        that a read error never lets a wipe through.
 
         Returns:
             tuple: (is_mounted, mount_info_list)
         """
         try:
-            # Check if the device itself is mounted
-            mount_output = subprocess.check_output(['mount']).decode()
-            device_mounted = self.device_path in mount_output
-
-            # Get detailed mount information using lsblk
-            cmd = ['lsblk', '-o', 'NAME,MOUNTPOINT', self.device_path, '-n']
-            lsblk_output = subprocess.check_output(cmd).decode()
-
-            mounted_partitions = []
-            for line in lsblk_output.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 2 and parts[1] and parts[1] != '-':
-                        mounted_partitions.append(f"/dev/{parts[0]} -> "
-                                                  f"{parts[1]}")
-
-            is_mounted = device_mounted or len(mounted_partitions) > 0
-            mount_info = mounted_partitions if mounted_partitions else []
-
-            return is_mounted, mount_info
-        except Exception:
-            return False, []
+            mount_info = [f"/dev/{name} -> {mount_point}"
+                          for name, mount_point in
+                          self._get_mount_points(self._get_device_numbers())]
+            return len(mount_info) > 0, mount_info
+        except Exception as e:
+            return True, [f"Could not check mount status: {e}"]
+
+    def _get_mount_points(self, devices):
+        """
+        Find where the given devices are mounted or used as swap.
+
+        Args:
+            devices: "major:minor" string -> device name, as returned by
+                     _get_device_numbers()
+
+        Returns:
+            list: (device name, mount point) pairs in mount table order,
+                  followed by (device name, '[SWAP]') for active swap
+        """
+        names = set(devices.values())
+        mount_points = []
+        with open(MOUNTINFO_PATH, 'r') as f:
+            for line in f:
+                # ID PARENT MAJOR:MINOR ROOT MOUNTPOINT ... - TYPE SOURCE
+                fields = line.split()
+                source = fields[fields.index('-', 6) + 2]
+                name = devices.get(fields[2])
+                if name is None and source.startswith('/dev/') and \
+                        source[len('/dev/'):] in names:
+                    name = source[len('/dev/'):]
+                if name is not None:
+                    mount_points.append((name, _unescape(fields[4])))
+
+        with open(SWAPS_PATH, 'r') as f:
+            next(f, None)  # Filename Type Size Used Priority
+            for line in f:
+                # Swap files live on a filesystem already seen as a mount
+                path = _unescape(line.split()[0])
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    st = None
+                if st is not None and stat.S_ISBLK(st.st_mode):
+                    name = devices.get(
+                        f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}")
+                elif path.startswith('/dev/') and \
+                        path[len('/dev/'):] in names:
+                    name = path[len('/dev/'):]
+                else:
+                    name = None
+                if name is not None:
+                    mount_points.append((name, '[SWAP]'))
+        return mount_points
+
+    def _walk_devices(self):
+        """
+        Walk the device, its partitions and their holders from sysfs.
+
+        Holders are the device-mapper (LUKS, LVM) and md devices built on
+        the disk or a partition, found by following holders/ recursively.
+        Devices come in display order: each one is followed by its
+        partitions and holders.
+
+        Returns:
+            list: (depth, name, type, "major:minor", sysfs_dir) tuples,
+                  depth 0 for the device itself; name is as under /dev
+                  (mapper/<name> for device-mapper devices)
+
+        Raises:
+            FileNotFoundError: If the device has no sysfs entry
+        """
+        root = os.path.basename(os.path.realpath(self.device_path))
+        devices = []
+        seen = set()
+        pending = [(0, root, os.path.join(SYSFS_BLOCK_DIR, root), 'disk')]
+        while pending:
+            depth, entry, entry_dir, kind = pending.pop()
+            if entry in seen:
+                continue
+            try:
+                with open(os.path.join(entry_dir, 'dev'), 'r') as f:
+                    number = f.read().strip()
+            except OSError:
+                continue
+            seen.add(entry)
+            name, holder_kind = self._describe_holder(entry, entry_dir)
+            devices.append((depth, name, holder_kind or kind, number,
+                            entry_dir))
+
+            children = []
+            if kind != 'part':
+                children.extend(
+                    (depth + 1, part, os.path.join(entry_dir, part), 'part')
+                    for part in sorted(os.listdir(entry_dir))
+                    if part.startswith(entry))
+            try:
+                holders = sorted(os.listdir(os.path.join(entry_dir,
+                                                         'holders')))
+            except FileNotFoundError:
+                holders = []
+            children.extend(
+                (depth + 1, holder, os.path.join(SYSFS_BLOCK_DIR, holder),
+                 'disk') for holder in holders)
+            pending.extend(reversed(children))
+
+        if not devices:
+            raise FileNotFoundError(
+                f"No sysfs entry for {self.device_path}")
+        return devices
+
+    @staticmethod
+    def _describe_holder(entry, entry_dir):
+        """
+        Name and classify a device-mapper or md device.
+
+        Args:
+            entry: Kernel device name (e.g. 'dm-0', 'md0')
+            entry_dir: Its sysfs directory
+
+        Returns:
+            tuple: (name, type) where name is 'mapper/<name>' for
+                   device-mapper devices and type is 'crypt', 'lvm',
+                   'dm' or the md RAID level; (entry, None) otherwise
+        """
+        try:
+            with open(os.path.join(entry_dir, 'dm', 'name'), 'r') as f:
+                name = 'mapper/' + f.read().strip()
+        except OSError:
+            try:
+                with open(os.path.join(entry_dir, 'md', 'level'), 'r') as f:
+                    return entry, f.read().strip() or 'md'
+            except OSError:
+                return entry, None
+        try:
+            with open(os.path.join(entry_dir, 'dm', 'uuid'), 'r') as f:
+                uuid = f.read()
+        except OSError:
+            uuid = ''
+        if uuid.startswith('CRYPT-'):
+            return name, 'crypt'
+        if uuid.startswith('LVM-'):
+            return name, 'lvm'
+        return name, 'dm'
+
+    def _get_device_numbers(self, devices=None):
+        """
+        Get device numbers of the device, its partitions and their holders.
+
+        Args:
+            devices: Result of _walk_devices(), walked now if not given
+
+        Returns:
+            dict: "major:minor" string -> device name relative to /dev
+        """
+        if devices is None:
+            devices = self._walk_devices()
+        return {number: name for _depth, name, _kind, number, _dir in devices}
 
     def get_partitions(self):
         """
-        Get partition information using lsblk.
+        Get the device, its partitions and holders with sizes from sysfs.
+
+        Holders (LUKS, LVM, md) are indented under the device they are
+        built on, and mount points (or [SWAP]) are read from the kernel.
 
         Returns:
             str: Formatted partition information
         """
         try:
-            cmd = ['lsblk', '-o', 'NAME,SIZE,TYPE,MOUNTPOINTS',
-                   self.device_path]
-            partitions = subprocess.check_output(cmd).decode()
-            return partitions
+            devices = self._walk_devices()
+            mount_points = {}
+            try:
+                for name, mount_point in self._get_mount_points(
+                        self._get_device_numbers(devices)):
+                    mount_points.setdefault(name, []).append(mount_point)
+            except (OSError, ValueError, IndexError):
+                pass  # Shown without mount points; is_mounted() reports it
+
+            lines = [f"{'NAME':<24}{'SIZE':>10} {'TYPE':<6}MOUNTPOINTS"]
+            for depth, name, kind, _number, entry_dir in devices:
+                with open(os.path.join(entry_dir, 'size'), 'r') as f:
+                    size = int(f.read()) * SYSFS_SECTOR_SIZE
+                lines.append(f"{'  ' * depth + name:<24}"
+                             f"{size / GIGABYTE:>9.1f}G {kind:<6}"
+                             f"{', '.join(mount_points.get(name, []))}"
+                             .rstrip())
+            return "\n".join(lines) + "\n"
         except Exception as e:
             return f"Error getting partition info: {e}"
 
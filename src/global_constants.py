@@ -21,13 +21,43 @@ MAX_SIZE_BYTES = TERABYTE  # 1TB maximum
 DEFAULT_CHUNK_SIZE = 100 * MEGABYTE  # 100MB
 SMALL_CHUNK_SIZE = 10 * MEGABYTE     # 10MB
 MAX_SMALL_CHUNK_SIZE = 10 * MEGABYTE  # 10MB max for small chunk algorithm
+ADAPTIVE_MIN_CHUNK_SIZE = 4 * MEGABYTE  # Adaptive chunk size lower bound
+ADAPTIVE_MAX_CHUNK_SIZE = 256 * MEGABYTE  # Adaptive chunk size upper bound
+ADAPTIVE_TARGET_CHUNK_SECONDS = 1.0  # Adaptive chunks sized to take ~1s
+ADAPTIVE_SPEED_SMOOTHING = 0.4  # EWMA weight, ~last 4 chunks (2 / (4 + 1))
+CHUNK_ALIGNMENT = MEGABYTE  # Chunk multiple if device reports no optimal I/O
+
+# Random data generation
+RANDOM_BLOCK_SIZE = MEGABYTE  # os.urandom() fills chunk buffers 1MB at a time
+
+# Direct I/O settings
+DIRECT_IO_ALIGNMENT = 4096  # Page size; covers 512B and 4K logical blocks
 
 # Progress file settings
 PROGRESS_FILE_NAME = "wipeit_progress.json"  # Single file for all devices
+PROGRESS_TEMP_FILE_NAME = PROGRESS_FILE_NAME + ".tmp"  # Atomic save target
+
+# udev database: one file per device, named b<major>:<minor> for block
+# devices, holding the same E:KEY=VALUE properties udevadm prints
+UDEV_DATA_DIR = "/run/udev/data"
+
+# Mount table and block device numbers, read instead of running mount/lsblk
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+SWAPS_PATH = "/proc/swaps"  # Active swap devices, which are not mounts
+SYSFS_BLOCK_DIR = "/sys/class/block"
+SYSFS_DEV_BLOCK_DIR = "/sys/dev/block"  # <major>:<minor> -> device dir
+SYSFS_SECTOR_SIZE = 512  # sysfs "size" counts 512-byte sectors
+
+# Disk types that can erase themselves (--secure-discard, --zero-out)
+FLASH_DISK_TYPES = ("SSD", "NVMe SSD", "eMMC/MMC")
 
 # Linux ioctl constants
 # BLKGETSIZE64 - Get device size in bytes (64-bit)
 BLKGETSIZE64 = 0x80081272
+# BLKZEROOUT - Zero a byte range (start, length) in the kernel/drive
+BLKZEROOUT = 0x127F
+# BLKSECDISCARD - Securely discard a byte range (start, length)
+BLKSECDISCARD = 0x127D
 
 # Time conversion constants
 SECONDS_PER_MINUTE = 60
@@ -43,7 +73,9 @@ HIGH_VARIANCE_THRESHOLD_MBPS = 100  # MB/s
 
 # Progress milestone thresholds
 MILESTONE_INCREMENT_PERCENT = 5  # 5% increments for display
+PROGRESS_DISPLAY_INTERVAL = 1.0  # Seconds between progress line redraws
 PROGRESS_SAVE_THRESHOLD = 100 * MEGABYTE  # Save progress every 100MB
+PROGRESS_SYNC_INTERVAL = 10.0  # Minimum seconds between device syncs
 
 # Test constants
 TEST_DEVICE_SIZE_100MB = 100 * MEGABYTE
@@ -66,6 +98,7 @@ TEST_CHUNK_SIZE_100MB = 100 * MEGABYTE
 
 # Time test constants
 TEST_TIME_1_HOUR_SECONDS = 3600
+TEST_TIMESTAMP_2024_01_01 = 1704067200.0  # 2024-01-01 00:00:00 UTC
 
 # Milestone test thresholds
 TEST_MILESTONE_5_PERCENT = 5
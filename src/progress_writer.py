@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+ProgressWriter class for wipeit - Secure device wiping utility.
+
+Saves wipe progress on a background thread so the wipe loop never waits
+on JSON serialization, the progress file write or its fsync.
+"""
+
+import threading
+
+
+class ProgressWriter:
+    """
+    Background progress saver with a single pending slot.
+
+    submit() records the latest checkpoint and returns immediately. If a
+    save is still running, newer checkpoints replace the pending one, so
+    only the most recent position is ever written. Use as a context
+    manager: leaving it waits for the pending save, so a later synchronous
+    save (e.g. on interrupt) cannot be overwritten by an older one.
+    """
+
+    def __init__(self, save):
+        """
+        Initialize progress writer.
+
+        Args:
+            save: Function called with the submitted arguments
+                  (normally wipeit.save_progress)
+        """
+        self._save = save
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        """Save pending checkpoints until closed and drained."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                args = self._pending
+                self._pending = None
+            self._save(*args)
+
+    def submit(self, *args):
+        """
+        Queue a checkpoint, replacing any checkpoint not yet saved.
+
+        Args:
+            *args: Arguments for the save function
+        """
+        with self._condition:
+            self._pending = args
+            self._condition.notify()
+
+    def close(self):
+        """Save any pending checkpoint and stop the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for chunk_producer - background random chunk generation.
+"""
+
+import mmap
+import threading
+import unittest
+from unittest.mock import patch
+
+from chunk_producer import ChunkProducer
+from global_constants import RANDOM_BLOCK_SIZE
+
+
+def _counting_urandom():
+    """Build an os.urandom stand-in that returns distinct fills per call."""
+    calls = []
+
+    def urandom(size):
+        calls.append(size)
+        return bytes([len(calls) % 256]) * size
+    return urandom, calls
+
+
+class TestChunkProducer(unittest.TestCase):
+    """Test ChunkProducer class."""
+
+    def test_chunks_come_back_in_request_order_and_sizes(self):
+        """Test chunks come back in request order with requested sizes."""
+        urandom, _calls = _counting_urandom()
+
+        with patch('chunk_producer.os.urandom', side_effect=urandom), \
+                ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            producer.request(100)
+            producer.request(7)
+            first = producer.take()
+            second = producer.take()
+
+        self.assertEqual(first, bytes([1]) * 100)
+        self.assertEqual(second, bytes([2]) * 7)
+
+    def test_fills_buffer_in_random_blocks(self):
+        """Test os.urandom() is called one RANDOM_BLOCK_SIZE at a time."""
+        urandom, calls = _counting_urandom()
+
+        with patch('chunk_producer.os.urandom', side_effect=urandom), \
+                ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            producer.request(RANDOM_BLOCK_SIZE + 10)
+            chunk = producer.take()
+
+        self.assertEqual(calls, [RANDOM_BLOCK_SIZE, 10])
+        self.assertEqual(chunk, bytes([1]) * RANDOM_BLOCK_SIZE +
+                         bytes([2]) * 10)
+
+    def test_generates_on_background_thread(self):
+        """Test os.urandom() runs off the calling thread."""
+        threads = []
+
+        def urandom(size):
+            threads.append(threading.current_thread())
+            return bytes(size)
+
+        with patch('chunk_producer.os.urandom', side_effect=urandom), \
+                ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            producer.request(16)
+            self.assertEqual(producer.take(), bytes(16))
+
+        self.assertNotEqual(threads, [threading.current_thread()])
+
+    def test_buffers_alternate_and_are_reused(self):
+        """Test chunks alternate between two buffers that are reused."""
+        with ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            owners = []
+            for size in (4096, 4096, 1024, 4096):
+                producer.request(size)
+                chunk = producer.take()
+                self.assertEqual(len(chunk), size)
+                owners.append(chunk.obj)
+
+        self.assertIsInstance(owners[0], mmap.mmap)
+        self.assertIsNot(owners[0], owners[1])
+        self.assertEqual(owners[2:], owners[:2])
+
+    def test_generation_error_raised_by_take(self):
+        """Test an error in the producer thread surfaces in take()."""
+        with patch('chunk_producer.os.urandom',
+                   side_effect=MemoryError("out of memory")), \
+                ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            producer.request(16)
+            with self.assertRaises(MemoryError):
+                producer.take()
+
+    def test_buffers_allocated_once_at_max_size(self):
+        """Test larger chunks reuse the buffers instead of replacing them."""
+        with ChunkProducer(8192) as producer:
+            buffers = list(producer._buffers)
+            for size in (1024, 1024, 8192, 8192):
+                producer.request(size)
+                producer.take()
+
+        self.assertEqual(producer._buffers, buffers)
+        self.assertEqual([len(b) for b in buffers], [8192, 8192])
+
+    def test_chunk_over_max_size_raised_by_take(self):
+        """Test a chunk larger than the buffers is refused."""
+        with ChunkProducer(4096) as producer:
+            producer.request(4097)
+            with self.assertRaises(ValueError):
+                producer.take()
+
+    def test_close_stops_thread_with_pending_request(self):
+        """Test leaving the context stops the thread even if not taken."""
+        with ChunkProducer(2 * RANDOM_BLOCK_SIZE) as producer:
+            producer.request(16)
+
+        self.assertFalse(producer._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,17 +7,51 @@ which handles device detection and information gathering.
 """
 
 import os
+import stat
 import subprocess
 import sys
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-# Add src directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add src directory to path for imports (once, even if re-imported)
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 import device_detector  # noqa: E402
 from global_constants import TEST_DEVICE_SIZE_1TB  # noqa: E402
 
+UDEVADM_SDB_ARGV = ('udevadm', 'info', '--query=property', '--name',
+                    '/dev/sdb')
+
+MOUNTINFO_ROOT_ONLY = ('22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 '
+                       'rw\n')
+MOUNTINFO_SDB_ON_USB = ('40 22 8:16 / /mnt/usb rw,relatime shared:9 - ext4 '
+                        '/dev/sdb rw\n')
+MOUNTINFO_SDB_PARTS_MOUNTED = (
+    '41 22 8:17 / /mnt/usb rw,relatime shared:10 - vfat /dev/sdb1 rw\n'
+    '42 22 8:18 / /media/my\\040data rw,relatime - ext4 /dev/sdb2 rw\n')
+MOUNTINFO_SDB1_BTRFS = ('43 22 0:45 / /srv rw,relatime shared:11 - btrfs '
+                        '/dev/sdb1 rw,space_cache=v2\n')
+MOUNTINFO_LVM_ON_LUKS = ('44 22 253:1 / /home rw,relatime shared:12 - ext4 '
+                         '/dev/mapper/vg-home rw\n')
+SWAPS_HEADER = 'Filename\t\t\t\tType\t\tSize\t\tUsed\t\tPriority\n'
+SWAPS_SDB2 = '/dev/sdb2\t\t\t\t\tpartition\t4194300\t\t0\t\t-2\n'
+UDEV_SAMSUNG_860 = (b'ID_MODEL=Samsung_SSD_860\n'
+                    b'ID_SERIAL_SHORT=1234567890\n'
+                    b'ID_BUS=ata\n')
+UDEV_SAMSUNG_860_EVO = (b'ID_MODEL=Samsung_SSD_860_EVO\n'
+                        b'ID_SERIAL_SHORT=S3Z5NB0K123456A\n')
+UDEV_GENERIC_DRIVE = b'ID_MODEL=Generic_Drive\n'
+
+
+def _dispatch(fixtures):
+    """Build a check_output side_effect that looks results up by argv."""
+    def check_output(argv, **_kwargs):
+        return fixtures[tuple(argv)]
+    return check_output
+
 
 class TestDeviceDetector(unittest.TestCase):
     """Test DeviceDetector class functionality."""
@@ -46,13 +80,54 @@ class TestDeviceDetector(unittest.TestCase):
         with self.assertRaises(OSError):
             detector.get_size()
 
+    @patch('device_detector.os.stat',
+           return_value=Mock(st_mode=stat.S_IFBLK | 0o660,
+                             st_rdev=os.makedev(8, 16)))
+    def test_get_block_device_size_from_sysfs(self, mock_stat):
+        """Test the size is read from sysfs sectors without an ioctl."""
+        with tempfile.TemporaryDirectory() as sysfs_dir:
+            os.makedirs(os.path.join(sysfs_dir, '8:16'))
+            with open(os.path.join(sysfs_dir, '8:16', 'size'), 'w') as f:
+                f.write('1953525168\n')
+
+            with patch('device_detector.SYSFS_DEV_BLOCK_DIR', sysfs_dir), \
+                    patch('device_detector.fcntl.ioctl') as mock_ioctl:
+                size = device_detector.DeviceDetector.get_block_device_size(
+                    '/dev/sdb')
+
+        self.assertEqual(size, 1953525168 * 512)
+        mock_ioctl.assert_not_called()
+
+    @patch('device_detector.os.stat',
+           return_value=Mock(st_mode=stat.S_IFBLK | 0o660,
+                             st_rdev=os.makedev(8, 16)))
+    @patch('device_detector.fcntl.ioctl')
+    def test_get_block_device_size_falls_back_to_ioctl(self, mock_ioctl,
+                                                       mock_stat):
+        """Test BLKGETSIZE64 is used when sysfs has no size entry."""
+        def fill_size(fd, request, buf):
+            buf[:] = (4096).to_bytes(8, sys.byteorder)
+
+        mock_ioctl.side_effect = fill_size
+        with tempfile.TemporaryDirectory() as sysfs_dir, \
+                tempfile.NamedTemporaryFile() as device:
+            with patch('device_detector.SYSFS_DEV_BLOCK_DIR', sysfs_dir):
+                size = device_detector.DeviceDetector.get_block_device_size(
+                    device.name)
+
+        self.assertEqual(size, 4096)
+        self.assertEqual(mock_ioctl.call_args.args[1],
+                         device_detector.BLKGETSIZE64)
+
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={})
     @patch('device_detector.subprocess.check_output')
-    def test_get_device_properties(self, mock_check_output):
+    def test_get_device_properties(self, mock_check_output,
+                                   mock_read_udev_database):
         """Test get_device_properties method."""
-        mock_output = ('ID_MODEL=Samsung_SSD_860\n'
-                       'ID_SERIAL_SHORT=1234567890\n'
-                       'ID_BUS=ata\n')
-        mock_check_output.return_value = mock_output.encode()
+        mock_check_output.side_effect = _dispatch({
+            UDEVADM_SDB_ARGV: UDEV_SAMSUNG_860,
+        })
         detector = device_detector.DeviceDetector('/dev/sdb')
         props = detector.get_device_properties()
         expected = {
@@ -62,42 +137,135 @@ class TestDeviceDetector(unittest.TestCase):
         }
         self.assertEqual(props, expected)
 
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={})
+    @patch('device_detector.subprocess.check_output')
+    def test_get_device_properties_value_with_equals(
+            self, mock_check_output, mock_read_udev_database):
+        """Test udevadm values containing '=' are kept whole."""
+        mock_check_output.side_effect = _dispatch({
+            UDEVADM_SDB_ARGV: b'ID_PATH=pci-0000:00:1f.2-ata-1\n'
+                              b'ID_FS_LABEL=a=b\n',
+        })
+        detector = device_detector.DeviceDetector('/dev/sdb')
+
+        self.assertEqual(detector.get_device_properties(), {
+            'ID_PATH': 'pci-0000:00:1f.2-ata-1',
+            'ID_FS_LABEL': 'a=b'})
+
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={})
     @patch('device_detector.subprocess.check_output')
-    def test_get_device_properties_error(self, mock_check_output):
+    def test_get_device_properties_error(self, mock_check_output,
+                                         mock_read_udev_database):
         """Test get_device_properties method with error."""
         mock_check_output.side_effect = subprocess.CalledProcessError(1, 'cmd')
         detector = device_detector.DeviceDetector('/dev/sdb')
         props = detector.get_device_properties()
         self.assertEqual(props, {})
 
-    @patch('device_detector.os.path.exists')
+    @patch('device_detector.os.stat',
+           return_value=Mock(st_mode=stat.S_IFBLK | 0o660,
+                             st_rdev=os.makedev(8, 16)))
+    def test_read_udev_database(self, mock_stat):
+        """Test properties are read from the device's udev database file."""
+        with tempfile.TemporaryDirectory() as udev_dir:
+            with open(os.path.join(udev_dir, 'b8:16'), 'w') as f:
+                f.write('S:disk/by-id/ata-Samsung\n'
+                        'E:ID_MODEL=Samsung_SSD_860\n'
+                        'E:ID_SERIAL_SHORT=1234567890\n'
+                        'G:systemd\n')
+            with patch('device_detector.UDEV_DATA_DIR', udev_dir):
+                detector = device_detector.DeviceDetector('/dev/sdb')
+                props = detector._read_udev_database()
+
+        self.assertEqual(props, {'ID_MODEL': 'Samsung_SSD_860',
+                                 'ID_SERIAL_SHORT': '1234567890'})
+
+    @patch('device_detector.os.stat',
+           return_value=Mock(st_mode=stat.S_IFREG | 0o644, st_rdev=0))
+    def test_read_udev_database_not_block_device(self, mock_stat):
+        """Test a path that is not a block device has no udev entry."""
+        detector = device_detector.DeviceDetector('/tmp/image.bin')
+        self.assertEqual(detector._read_udev_database(), {})
+
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={'ID_MODEL': 'Samsung_SSD_860'})
+    @patch('device_detector.subprocess.check_output')
+    def test_get_device_properties_prefers_database(
+            self, mock_check_output, mock_read_udev_database):
+        """Test udevadm is not run when the database has the device."""
+        detector = device_detector.DeviceDetector('/dev/sdb')
+
+        self.assertEqual(detector.get_device_properties(),
+                         {'ID_MODEL': 'Samsung_SSD_860'})
+        mock_check_output.assert_not_called()
+
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={'ID_MODEL': 'Samsung_SSD_860'})
+    def test_get_device_properties_cached(self, mock_read_udev_database):
+        """Test repeated lookups on one detector read udev once."""
+        detector = device_detector.DeviceDetector('/dev/sdb')
+
+        detector.get_device_properties()
+        detector.get_device_properties()
+
+        self.assertEqual(mock_read_udev_database.call_count, 1)
+
+    @patch('builtins.open')
+    def test_get_optimal_io_size(self, mock_open):
+        """Test optimal I/O size is read from the queue sysfs entry."""
+        mock_open.return_value.__enter__.return_value.read.return_value = \
+            '196608\n'
+        detector = device_detector.DeviceDetector('/dev/md0')
+
+        self.assertEqual(detector.get_optimal_io_size(), 196608)
+        mock_open.assert_called_once_with(
+            '/sys/block/md0/queue/optimal_io_size', 'r')
+
+    @patch('builtins.open', side_effect=FileNotFoundError)
+    def test_get_optimal_io_size_unavailable(self, mock_open):
+        """Test a missing sysfs entry means no optimal I/O size."""
+        detector = device_detector.DeviceDetector('/tmp/image.bin')
+        self.assertEqual(detector.get_optimal_io_size(), 0)
+
     @patch('builtins.open')
-    def test_check_rotational_ssd(self, mock_open, mock_exists):
+    def test_check_rotational_ssd(self, mock_open):
         """Test _check_rotational for SSD."""
-        mock_exists.return_value = True
         mock_open.return_value.__enter__.return_value.read.return_value = '0'
         detector = device_detector.DeviceDetector('/dev/sdb')
         result = detector._check_rotational()
         self.assertFalse(result)
 
-    @patch('device_detector.os.path.exists')
     @patch('builtins.open')
-    def test_check_rotational_hdd(self, mock_open, mock_exists):
+    def test_check_rotational_hdd(self, mock_open):
         """Test _check_rotational for HDD."""
-        mock_exists.return_value = True
-        mock_open.return_value.__enter__.return_value.read.return_value = '1'
+        mock_open.return_value.__enter__.return_value.read.return_value = \
+            '1\n'
         detector = device_detector.DeviceDetector('/dev/sdb')
         result = detector._check_rotational()
         self.assertTrue(result)
+        mock_open.assert_called_once_with(
+            '/sys/block/sdb/queue/rotational', 'r')
 
-    @patch('device_detector.os.path.exists')
-    def test_check_rotational_not_found(self, mock_exists):
+    @patch('builtins.open', side_effect=FileNotFoundError)
+    def test_check_rotational_not_found(self, mock_open):
         """Test _check_rotational when file doesn't exist."""
-        mock_exists.return_value = False
         detector = device_detector.DeviceDetector('/dev/sdb')
         result = detector._check_rotational()
         self.assertIsNone(result)
 
+    @patch('builtins.open')
+    def test_queue_attributes_read_once(self, mock_open):
+        """Test repeated detection reuses the sysfs value."""
+        mock_open.return_value.__enter__.return_value.read.return_value = '1'
+        detector = device_detector.DeviceDetector('/dev/sdb')
+
+        for _ in range(3):
+            self.assertTrue(detector._check_rotational())
+
+        mock_open.assert_called_once()
+
     def test_check_nvme_interface_true(self):
         """Test _check_nvme_interface for NVMe device."""
         detector = device_detector.DeviceDetector('/dev/nvme0n1')
@@ -258,73 +426,38 @@ class TestDeviceDetector(unittest.TestCase):
         self.assertEqual(result, ('UNKNOWN', 'LOW',
                                   ['Detection failed: Test error']))
 
-    @patch('device_detector.subprocess.check_output')
-    def test_is_mounted_not_mounted(self, mock_check_output):
-        """Test is_mounted when device is not mounted."""
-        mock_check_output.side_effect = [
-            b'/dev/sda1 on / type ext4 (rw,relatime)\n',
-            b'sdb\nsdb1\n'
-        ]
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        is_mounted, mount_info = detector.is_mounted()
-        self.assertFalse(is_mounted)
-        self.assertEqual(mount_info, [])
-
-    @patch('device_detector.subprocess.check_output')
-    def test_is_mounted_device_mounted(self, mock_check_output):
-        """Test is_mounted when device itself is mounted."""
-        mock_check_output.side_effect = [
-            b'/dev/sdb on /mnt/usb type ext4 (rw,relatime)\n',
-            b'sdb\nsdb1\n'
-        ]
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        is_mounted, mount_info = detector.is_mounted()
-        self.assertTrue(is_mounted)
-        self.assertEqual(mount_info, [])
-
-    @patch('device_detector.subprocess.check_output')
-    def test_is_mounted_partitions_mounted(self, mock_check_output):
-        """Test is_mounted when partitions are mounted."""
-        mock_check_output.side_effect = [
-            b'/dev/sda1 on / type ext4 (rw,relatime)\n',
-            b'sdb\nsdb1 /mnt/usb\nsdb2 /media/data\n'
-        ]
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        is_mounted, mount_info = detector.is_mounted()
-        self.assertTrue(is_mounted)
-        self.assertEqual(len(mount_info), 2)
-        self.assertIn('/dev/sdb1 -> /mnt/usb', mount_info)
-        self.assertIn('/dev/sdb2 -> /media/data', mount_info)
-
-    @patch('device_detector.subprocess.check_output')
-    def test_is_mounted_error(self, mock_check_output):
-        """Test is_mounted with error."""
-        mock_check_output.side_effect = subprocess.CalledProcessError(
-            1, 'mount')
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        is_mounted, mount_info = detector.is_mounted()
-        self.assertFalse(is_mounted)
-        self.assertEqual(mount_info, [])
-
-    @patch('device_detector.subprocess.check_output')
-    def test_get_partitions(self, mock_check_output):
-        """Test get_partitions method."""
-        mock_output = ('NAME   SIZE   TYPE MOUNTPOINTS\n'
-                       'sdb    128G   disk\n'
-                       '├─sdb1 64G    part\n'
-                       '└─sdb2 64G    part\n')
-        mock_check_output.return_value = mock_output.encode()
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        result = detector.get_partitions()
-        self.assertEqual(result, mock_output)
-
-    @patch('device_detector.subprocess.check_output')
-    def test_get_partitions_error(self, mock_check_output):
+    def test_get_partitions(self):
+        """Test get_partitions lists the device and partitions from sysfs."""
+        with tempfile.TemporaryDirectory() as sysfs_dir:
+            for entry, dev, sectors in (('', '8:16', '268435456'),
+                                        ('sdb1', '8:17', '134217728'),
+                                        ('sdb2', '8:18', '134215680')):
+                entry_dir = os.path.join(sysfs_dir, 'sdb', entry)
+                os.makedirs(entry_dir, exist_ok=True)
+                for name, value in (('dev', dev), ('size', sectors)):
+                    with open(os.path.join(entry_dir, name), 'w') as f:
+                        f.write(value + '\n')
+            os.makedirs(os.path.join(sysfs_dir, 'sdb', 'queue'))
+            missing = os.path.join(sysfs_dir, 'missing')
+
+            with patch('device_detector.SYSFS_BLOCK_DIR', sysfs_dir), \
+                    patch('device_detector.MOUNTINFO_PATH', missing):
+                detector = device_detector.DeviceDetector('/dev/sdb')
+                result = detector.get_partitions()
+
+        self.assertEqual(result,
+                         'NAME                          SIZE TYPE  '
+                         'MOUNTPOINTS\n'
+                         'sdb                         128.0G disk\n'
+                         '  sdb1                       64.0G part\n'
+                         '  sdb2                       64.0G part\n')
+
+    def test_get_partitions_error(self):
         """Test get_partitions method with error."""
-        mock_check_output.side_effect = subprocess.CalledProcessError(
-            1, 'lsblk')
-        detector = device_detector.DeviceDetector('/dev/sdb')
-        result = detector.get_partitions()
+        with tempfile.TemporaryDirectory() as sysfs_dir, \
+                patch('device_detector.SYSFS_BLOCK_DIR', sysfs_dir):
+            detector = device_detector.DeviceDetector('/dev/sdb')
+            result = detector.get_partitions()
         self.assertIn('Error getting partition info', result)
 
     @patch('device_detector.DeviceDetector.get_size')
@@ -448,13 +581,15 @@ class TestDeviceDetector(unittest.TestCase):
             self.assertIn('📌 Mounted partitions:', str(calls[1]))
             self.assertIn('/dev/sdb1 -> /mnt/usb', str(calls[2]))
 
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={})
     @patch('device_detector.subprocess.check_output')
-    def test_get_unique_id(self, mock_check_output):
+    def test_get_unique_id(self, mock_check_output,
+                           mock_read_udev_database):
         """Test get_unique_id method returns device identifiers."""
-        udev_output = b"""ID_MODEL=Samsung_SSD_860_EVO
-ID_SERIAL_SHORT=S3Z5NB0K123456A
-"""
-        mock_check_output.return_value = udev_output
+        mock_check_output.side_effect = _dispatch({
+            UDEVADM_SDB_ARGV: UDEV_SAMSUNG_860_EVO,
+        })
         detector = device_detector.DeviceDetector('/dev/sdb')
 
         # Mock get_size to avoid actual device access
@@ -468,12 +603,15 @@ ID_SERIAL_SHORT=S3Z5NB0K123456A
         # Should only have 3 keys: serial, model, size
         self.assertEqual(len(unique_id), 3)
 
+    @patch.object(device_detector.DeviceDetector, '_read_udev_database',
+                  return_value={})
     @patch('device_detector.subprocess.check_output')
-    def test_get_unique_id_missing_fields(self, mock_check_output):
+    def test_get_unique_id_missing_fields(self, mock_check_output,
+                                          mock_read_udev_database):
         """Test get_unique_id when some fields are missing."""
-        udev_output = b"""ID_MODEL=Generic_Drive
-"""
-        mock_check_output.return_value = udev_output
+        mock_check_output.side_effect = _dispatch({
+            UDEVADM_SDB_ARGV: UDEV_GENERIC_DRIVE,
+        })
         detector = device_detector.DeviceDetector('/dev/sdb')
 
         with patch.object(detector, 'get_size', return_value=1000000000):
@@ -487,5 +625,173 @@ ID_SERIAL_SHORT=S3Z5NB0K123456A
         self.assertEqual(len(unique_id), 3)
 
 
+class TestMountChecking(unittest.TestCase):
+    """Test DeviceDetector.is_mounted mount checking."""
+
+    def setUp(self):
+        """Create a fake sysfs tree for sdb and point the detector at it."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        sysfs = os.path.join(temp_dir.name, 'sys')
+        for entry, dev in (('', '8:16'), ('sdb1', '8:17'), ('sdb2', '8:18')):
+            os.makedirs(os.path.join(sysfs, 'sdb', entry), exist_ok=True)
+            with open(os.path.join(sysfs, 'sdb', entry, 'dev'), 'w') as f:
+                f.write(dev + '\n')
+            with open(os.path.join(sysfs, 'sdb', entry, 'size'), 'w') as f:
+                f.write('2097152\n' if entry else '4194304\n')
+        os.makedirs(os.path.join(sysfs, 'sdb', 'queue'))
+        self.sysfs = sysfs
+        self.mountinfo = os.path.join(temp_dir.name, 'mountinfo')
+        self.swaps = os.path.join(temp_dir.name, 'swaps')
+        self._write_swaps(SWAPS_HEADER)
+
+        for name, value in (('SYSFS_BLOCK_DIR', sysfs),
+                            ('MOUNTINFO_PATH', self.mountinfo),
+                            ('SWAPS_PATH', self.swaps)):
+            patcher = patch(f'device_detector.{name}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write_mountinfo(self, content):
+        """Write the fake mount table."""
+        with open(self.mountinfo, 'w') as f:
+            f.write(content)
+
+    def _write_swaps(self, content):
+        """Write the fake swap list."""
+        with open(self.swaps, 'w') as f:
+            f.write(content)
+
+    def _add_holder(self, parent_dir, holder, dev, dm_name, dm_uuid):
+        """Stack a device-mapper device on top of parent_dir."""
+        holder_dir = os.path.join(self.sysfs, holder)
+        os.makedirs(os.path.join(holder_dir, 'dm'))
+        for name, value in (('dev', dev), ('size', '2093056'),
+                            (os.path.join('dm', 'name'), dm_name),
+                            (os.path.join('dm', 'uuid'), dm_uuid)):
+            with open(os.path.join(holder_dir, name), 'w') as f:
+                f.write(value + '\n')
+        os.makedirs(os.path.join(self.sysfs, parent_dir, 'holders', holder))
+
+    def _add_lvm_on_luks(self):
+        """Put LUKS on sdb2 and an LVM volume inside it."""
+        self._add_holder(os.path.join('sdb', 'sdb2'), 'dm-0', '253:0',
+                         'luks-sdb2', 'CRYPT-LUKS2-0123-luks-sdb2')
+        self._add_holder('dm-0', 'dm-1', '253:1', 'vg-home',
+                         'LVM-abcdef')
+
+    def test_get_device_numbers(self):
+        """Test the device and its partitions are read from sysfs."""
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        self.assertEqual(detector._get_device_numbers(),
+                         {'8:16': 'sdb', '8:17': 'sdb1', '8:18': 'sdb2'})
+
+    def test_is_mounted_not_mounted(self):
+        """Test is_mounted when device is not mounted."""
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertFalse(is_mounted)
+        self.assertEqual(mount_info, [])
+
+    def test_is_mounted_device_mounted(self):
+        """Test is_mounted when device itself is mounted."""
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY + MOUNTINFO_SDB_ON_USB)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/sdb -> /mnt/usb'])
+
+    def test_is_mounted_partitions_mounted(self):
+        """Test is_mounted when partitions are mounted."""
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY +
+                              MOUNTINFO_SDB_PARTS_MOUNTED)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/sdb1 -> /mnt/usb',
+                                      '/dev/sdb2 -> /media/my data'])
+
+    def test_is_mounted_btrfs_matched_by_source(self):
+        """Test a mount with an anonymous device number is matched."""
+        self._write_mountinfo(MOUNTINFO_SDB1_BTRFS)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/sdb1 -> /srv'])
+
+    def test_get_device_numbers_includes_holders(self):
+        """Test holders stacked on a partition are followed recursively."""
+        self._add_lvm_on_luks()
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        self.assertEqual(detector._get_device_numbers(),
+                         {'8:16': 'sdb', '8:17': 'sdb1', '8:18': 'sdb2',
+                          '253:0': 'mapper/luks-sdb2',
+                          '253:1': 'mapper/vg-home'})
+
+    def test_is_mounted_holder_mounted(self):
+        """Test a filesystem on LVM inside LUKS on a partition is found."""
+        self._add_lvm_on_luks()
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY + MOUNTINFO_LVM_ON_LUKS)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/mapper/vg-home -> /home'])
+
+    def test_is_mounted_swap_partition(self):
+        """Test a partition in use as swap counts as mounted."""
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY)
+        self._write_swaps(SWAPS_HEADER + SWAPS_SDB2)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        with patch('device_detector.os.stat', side_effect=FileNotFoundError):
+            is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/sdb2 -> [SWAP]'])
+
+    def test_is_mounted_swap_on_holder_matched_by_number(self):
+        """Test swap on a holder is matched by its device number."""
+        self._add_lvm_on_luks()
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY)
+        self._write_swaps(SWAPS_HEADER + '/dev/dm-1 partition 4194300 0 -2\n')
+        swap_stat = Mock(st_mode=stat.S_IFBLK, st_rdev=os.makedev(253, 1))
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        with patch('device_detector.os.stat', return_value=swap_stat):
+            is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(mount_info, ['/dev/mapper/vg-home -> [SWAP]'])
+
+    def test_get_partitions_shows_holders_and_mount_points(self):
+        """Test the partition table shows holders and where they are used."""
+        self._add_lvm_on_luks()
+        self._write_mountinfo(MOUNTINFO_ROOT_ONLY +
+                              MOUNTINFO_SDB_PARTS_MOUNTED.splitlines(
+                                  keepends=True)[0] +
+                              MOUNTINFO_LVM_ON_LUKS)
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        self.assertEqual(detector.get_partitions(),
+                         'NAME                          SIZE TYPE  '
+                         'MOUNTPOINTS\n'
+                         'sdb                           2.0G disk\n'
+                         '  sdb1                        1.0G part  /mnt/usb\n'
+                         '  sdb2                        1.0G part\n'
+                         '    mapper/luks-sdb2          1.0G crypt\n'
+                         '      mapper/vg-home          1.0G lvm   /home\n')
+
+    def test_is_mounted_error(self):
+        """Test is_mounted fails closed when the device cannot be checked."""
+        detector = device_detector.DeviceDetector('/dev/missing')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertEqual(len(mount_info), 1)
+        self.assertIn('Could not check mount status', mount_info[0])
+
+    def test_is_mounted_unreadable_mount_table(self):
+        """Test is_mounted fails closed when the mount table is unreadable."""
+        detector = device_detector.DeviceDetector('/dev/sdb')
+        is_mounted, mount_info = detector.is_mounted()
+        self.assertTrue(is_mounted)
+        self.assertIn('Could not check mount status', mount_info[0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Unit tests for wipeit device listing and resume auto-detection.
+"""
+
+import subprocess
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, call, patch
+
+# Import modules from the same directory
+import wipeit
+from global_constants import (
+    TEST_CHUNK_SIZE_100MB,
+    TEST_TOTAL_SIZE_4GB,
+)
+from wipeit_test_helpers import (
+    ROOT_EUID,
+    TempCwdTestCase,
+    check_output_dispatch,
+    make_progress,
+    run_as,
+    write_progress,
+)
+
+
+class TestDeviceInfoFunctions(unittest.TestCase):
+    """Test device information functions."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Install a single check_output patch for the whole class."""
+        cls._check_output_patcher = patch.object(
+            wipeit.subprocess, 'check_output', autospec=True)
+        # Keep the Mock behind the autospecced function: a function stored
+        # on the class would otherwise be bound as a method.
+        cls.mock_check_output = cls._check_output_patcher.start().mock
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the class-wide check_output patch."""
+        cls._check_output_patcher.stop()
+
+    def setUp(self):
+        """Reset the shared check_output mock between tests."""
+        self.mock_check_output.reset_mock(return_value=True)
+        # reset_mock(side_effect=True) leaves the autospec side_effect set
+        self.mock_check_output.side_effect = None
+
+    def test_list_all_devices(self):
+        """Test listing all devices."""
+        self.mock_check_output.side_effect = check_output_dispatch
+
+        # Mock DeviceDetector methods for each device
+        with patch('wipeit.DeviceDetector') as mock_detector_class:
+            # Create mock detector instances
+            mock_detector_sda = MagicMock()
+            mock_detector_sdb = MagicMock()
+
+            # Set up the mock to return different instances for different
+            # devices
+            def mock_detector_side_effect(device_path):
+                if device_path == '/dev/sda':
+                    return mock_detector_sda
+                elif device_path == '/dev/sdb':
+                    return mock_detector_sdb
+                return MagicMock()
+
+            mock_detector_class.side_effect = mock_detector_side_effect
+
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                wipeit.list_all_devices()
+
+            # Verify each device's info was displayed once
+            for detector in (mock_detector_sda, mock_detector_sdb):
+                self.assertEqual(detector.mock_calls, [call.display_info()])
+
+            output = mock_stdout.getvalue()
+            # The output should contain the separator lines
+            self.assertIn('---', output)
+
+    def test_get_disk_devices_keeps_only_disks(self):
+        """Test partitions, ROMs and blank lines are skipped."""
+        self.mock_check_output.return_value = (
+            b"sda disk\nsda1 part\nsr0 rom\n\nnvme0n1 disk\nloop0\n")
+
+        self.assertEqual(wipeit.get_disk_devices(),
+                         ['/dev/sda', '/dev/nvme0n1'])
+        self.mock_check_output.assert_called_once_with(
+            ['lsblk', '-dno', 'NAME,TYPE'])
+
+    def test_list_all_devices_keeps_lsblk_order(self):
+        """Test devices are printed in lsblk order."""
+        self.mock_check_output.return_value = b"sdb disk\nsda disk\n"
+        displayed = []
+
+        def make_detector(device_path):
+            detector = MagicMock()
+            detector.display_info.side_effect = (
+                lambda: displayed.append(device_path))
+            return detector
+
+        with patch('wipeit.DeviceDetector', side_effect=make_detector), \
+                patch('sys.stdout', new_callable=StringIO):
+            wipeit.list_all_devices()
+
+        self.assertEqual(displayed, ['/dev/sdb', '/dev/sda'])
+
+
+class TestAutoDetectResume(TempCwdTestCase):
+    """Test auto-detection of resume drive functionality."""
+
+    @patch.object(subprocess, 'check_output', autospec=True)
+    @patch('wipeit.DeviceDetector')
+    def test_find_device_by_serial_model_found(
+            self, mock_detector_class, mock_subprocess):
+        """Test successful device auto-detection by serial and model."""
+        # Create progress file with device_id
+        device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+        write_progress(self.test_progress_file, device_id=device_id)
+
+        mock_subprocess.side_effect = check_output_dispatch
+
+        # Mock DeviceDetector for two devices
+        mock_detector_sda = MagicMock()
+        mock_detector_sda.get_unique_id.return_value = {
+            'serial': 'DIFFERENT_SERIAL',
+            'model': 'Different_Model',
+            'size': 1000000000
+        }
+
+        mock_detector_sdb = MagicMock()
+        mock_detector_sdb.get_unique_id.return_value = device_id
+
+        def mock_detector_side_effect(device_path):
+            if device_path == '/dev/sda':
+                return mock_detector_sda
+            elif device_path == '/dev/sdb':
+                return mock_detector_sdb
+            return MagicMock()
+
+        mock_detector_class.side_effect = mock_detector_side_effect
+
+        # Test the function
+        detected_device, detected_id = wipeit.find_device_by_serial_model()
+
+        # Verify it found the right device
+        self.assertEqual(detected_device, '/dev/sdb')
+        self.assertEqual(detected_id['serial'], 'TEST123456')
+        self.assertEqual(detected_id['model'], 'TestDrive_Model')
+
+    @patch.object(subprocess, 'check_output', autospec=True)
+    @patch('wipeit.DeviceDetector')
+    def test_find_device_by_serial_model_not_found(
+            self, mock_detector_class, mock_subprocess):
+        """Test when no device matches the saved serial."""
+        # Create progress file with device_id
+        device_id = {
+            'serial': 'ORIGINAL_SERIAL',
+            'model': 'Original_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+        write_progress(self.test_progress_file, device_id=device_id)
+
+        mock_subprocess.side_effect = check_output_dispatch
+
+        # Mock DeviceDetector - neither device matches
+        mock_detector = MagicMock()
+        mock_detector.get_unique_id.return_value = {
+            'serial': 'DIFFERENT_SERIAL',
+            'model': 'Different_Model',
+            'size': 1000000000
+        }
+        mock_detector_class.return_value = mock_detector
+
+        # Test the function
+        detected_device, detected_id = wipeit.find_device_by_serial_model()
+
+        # Verify nothing was found
+        self.assertIsNone(detected_device)
+        self.assertIsNone(detected_id)
+
+    def test_find_device_by_serial_model_no_progress_file(self):
+        """Test when there's no progress file."""
+        # Don't create progress file
+
+        # Test the function
+        detected_device, detected_id = wipeit.find_device_by_serial_model()
+
+        # Verify nothing was found
+        self.assertIsNone(detected_device)
+        self.assertIsNone(detected_id)
+
+    @patch.object(subprocess, 'check_output', autospec=True)
+    @patch('wipeit.DeviceDetector')
+    def test_find_device_by_serial_model_no_serial_in_progress(
+            self, mock_detector_class, mock_subprocess):
+        """Test when progress file has no serial number."""
+        # Create progress file without device_id
+        write_progress(self.test_progress_file)
+
+        # Test the function
+        detected_device, detected_id = wipeit.find_device_by_serial_model()
+
+        # Verify nothing was found
+        self.assertIsNone(detected_device)
+        self.assertIsNone(detected_id)
+
+    def test_setup_argument_parser_resume_without_device(self):
+        """Test that --resume works without device specification."""
+        parser = wipeit.setup_argument_parser()
+        args = parser.parse_args(['--resume'])
+        self.assertTrue(args.resume)
+        self.assertIsNone(args.device)
+
+    @patch('sys.argv', ['wipeit.py', '--resume'])
+    @run_as(ROOT_EUID)
+    @patch('sys.exit')
+    @patch('wipeit.find_device_by_serial_model')
+    @patch('wipeit.find_resume_file')
+    @patch('wipeit.signal.signal')
+    def test_main_resume_without_device_auto_detects(
+            self, mock_signal, mock_find_resume, mock_find_device,
+            mock_exit):
+        """Test main() with --resume and no device calls auto-detection."""
+        # Mock find_resume_file to return progress data
+        device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+        mock_find_resume.return_value = make_progress(device_id=device_id)
+
+        # Mock find_device_by_serial_model to return detected device
+        mock_find_device.return_value = ('/dev/sdc', device_id)
+
+        # Mock other necessary functions
+        with patch('wipeit.parse_size',
+                   return_value=TEST_CHUNK_SIZE_100MB):
+            with patch('os.path.exists', return_value=True):
+                with patch('wipeit.DeviceDetector') as mock_detector_class:
+                    mock_detector = MagicMock()
+                    mock_detector.is_mounted.return_value = (False, [])
+                    mock_detector.display_info = MagicMock()
+                    mock_detector_class.return_value = mock_detector
+
+                    # Mock load_progress
+                    with patch('wipeit.load_progress',
+                               return_value=mock_find_resume.return_value):
+                        # Mock display_resume_info
+                        with patch('wipeit.display_resume_info',
+                                   return_value=False):
+                            # Mock wipe_device to avoid going deep
+                            with patch('wipeit.wipe_device'):
+                                with patch('builtins.input',
+                                           return_value='y'):
+                                    from io import StringIO
+                                    with patch('sys.stdout',
+                                               new_callable=StringIO) \
+                                            as mock_stdout:
+                                        wipeit.main()
+
+        output = mock_stdout.getvalue()
+
+        # Verify auto-detection was called
+        mock_find_device.assert_called_once()
+
+        # Verify output shows detection
+        self.assertIn('AUTO-DETECTING RESUME DRIVE', output)
+        self.assertIn('Found matching drive', output)
+
+    @patch('sys.argv', ['wipeit.py', '--resume'])
+    @run_as(ROOT_EUID)
+    @patch('sys.exit')
+    @patch('wipeit.find_device_by_serial_model')
+    @patch('wipeit.find_resume_file')
+    @patch('wipeit.list_all_devices')
+    def test_main_resume_without_device_no_match(
+            self, mock_list_devices, mock_find_resume,
+            mock_find_device, mock_exit):
+        """Test error handling when no matching device found."""
+        # Mock find_resume_file to return progress data
+        device_id = {
+            'serial': 'ORIGINAL_SERIAL',
+            'model': 'Original_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+        mock_find_resume.return_value = make_progress(device_id=device_id)
+
+        # Mock find_device_by_serial_model to return None (not found)
+        mock_find_device.return_value = (None, None)
+
+        from io import StringIO
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            wipeit.main()
+
+        output = mock_stdout.getvalue()
+
+        # Verify error message shown
+        self.assertIn('ERROR: Could not find matching drive', output)
+        self.assertIn('ORIGINAL_SERIAL', output)
+        self.assertIn('POSSIBLE REASONS', output)
+
+        # Verify list_all_devices was called
+        mock_list_devices.assert_called()
+
+        # Verify sys.exit was called with error code
+        mock_exit.assert_called_with(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,18 +3,22 @@
 Unit tests for disk_pretest - HDD pretest operations.
 """
 
+import errno
+import os
 import unittest
 from io import StringIO
-from unittest.mock import mock_open, patch
+from unittest.mock import Mock, call, mock_open, patch
 
 from disk_pretest import DiskPretest, PretestResults
 from global_constants import (
     DEFAULT_CHUNK_SIZE,
+    DIRECT_IO_ALIGNMENT,
     GIGABYTE,
     HIGH_VARIANCE_THRESHOLD_MBPS,
     LOW_SPEED_THRESHOLD_MBPS,
     MEGABYTE,
 )
+from wipeit_test_helpers import start_patch
 
 
 class TestPretestResults(unittest.TestCase):
@@ -96,9 +100,15 @@ class TestDiskPretest(unittest.TestCase):
 class TestPretestExecution(unittest.TestCase):
     """Test pretest execution methods."""
 
+    def setUp(self):
+        """Record probe writes and cache advice instead of issuing them."""
+        self.mock_pwrite = start_patch(self, patch('disk_pretest.os.pwrite'))
+        self.mock_fadvise = start_patch(
+            self, patch('disk_pretest.os.posix_fadvise'))
+
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_test_position(self, mock_time, mock_fsync, mock_file):
         """Test _test_position method."""
         mock_time.side_effect = [1000.0, 1001.0]
@@ -110,12 +120,36 @@ class TestPretestExecution(unittest.TestCase):
 
         self.assertIsInstance(speed, float)
         self.assertGreater(speed, 0)
-        mock_file_handle.seek.assert_called_once_with(0)
-        mock_file_handle.write.assert_called_once()
+        self.mock_pwrite.assert_called_once_with(
+            3, pretest._get_test_data(), 0)
+        mock_fsync.assert_called_once_with(3)
+        self.mock_fadvise.assert_called_once_with(
+            3, 0, 100 * MEGABYTE, os.POSIX_FADV_DONTNEED)
+
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('os.fsync')
+    @patch('time.perf_counter')
+    def test_test_position_direct_times_fsync(self, mock_time, mock_fsync,
+                                              mock_file):
+        """Test O_DIRECT probes still time an fsync of the drive cache."""
+        calls = Mock()
+        calls.attach_mock(mock_time, 'perf_counter')
+        calls.attach_mock(self.mock_pwrite, 'pwrite')
+        calls.attach_mock(mock_fsync, 'fsync')
+        mock_time.side_effect = [1000.0, 1001.0]
+        pretest = DiskPretest('/dev/sdb', MEGABYTE, quiet=True)
+        pretest._direct_io = True
+
+        pretest._test_position(0, 'beginning')
+
+        self.assertEqual([name for name, _, _ in calls.mock_calls],
+                         ['perf_counter', 'pwrite', 'fsync',
+                          'perf_counter'])
+        self.mock_fadvise.assert_not_called()
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_test_position_with_output(self, mock_time, mock_fsync, mock_file):
         """Test _test_position with console output."""
         mock_time.side_effect = [1000.0, 1001.0]
@@ -131,10 +165,64 @@ class TestPretestExecution(unittest.TestCase):
         self.assertIn('Testing beginning', output)
         self.assertIn('Beginning:', output)
 
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('os.fsync')
+    @patch('os.urandom')
+    @patch('time.perf_counter')
+    def test_test_data_drawn_once(self, mock_time, mock_urandom, mock_fsync,
+                                  mock_file):
+        """Test all positions reuse a single os.urandom() draw."""
+        mock_time.side_effect = [1000.0, 1001.0, 1001.0, 1002.0]
+        mock_urandom.return_value = b'\x5a' * MEGABYTE
+        mock_file_handle = mock_file.return_value.__enter__.return_value
+        mock_file_handle.fileno.return_value = 3
+
+        pretest = DiskPretest('/dev/sdb', MEGABYTE, quiet=True)
+        for position, name in ((0, 'beginning'), (MEGABYTE, 'end')):
+            pretest._test_position(position, name)
+
+        mock_urandom.assert_called_once_with(MEGABYTE)
+        written = [c.args[1] for c in self.mock_pwrite.call_args_list]
+        self.assertEqual(len(written), 2)
+        self.assertIs(written[0], written[1])
+        self.assertEqual([c.args[2] for c in self.mock_pwrite.call_args_list],
+                         [0, MEGABYTE])
+        self.assertEqual(written[0][:], mock_urandom.return_value)
+
+    @patch('device_detector.DeviceDetector.get_block_device_size',
+           return_value=100 * GIGABYTE + 512)
+    def test_run_pretest_positions_block_aligned(self, mock_get_size):
+        """Test middle and end probes start on O_DIRECT boundaries."""
+        pretest = DiskPretest('/dev/sdb', 16 * MEGABYTE, quiet=True)
+
+        with patch.object(pretest, '_test_position',
+                          return_value=100.0) as mock_test_position:
+            pretest.run_pretest()
+
+        self.assertEqual(mock_test_position.call_args_list, [
+            call(0, 'beginning'),
+            call(50 * GIGABYTE, 'middle'),
+            call(100 * GIGABYTE - 16 * MEGABYTE, 'end')])
+        for args in mock_test_position.call_args_list:
+            self.assertEqual(args.args[0] % DIRECT_IO_ALIGNMENT, 0)
+
+    @patch('disk_pretest.os.open',
+           side_effect=[OSError(errno.EINVAL, 'EINVAL'), 5])
+    def test_direct_opener_falls_back(self, mock_os_open):
+        """Test probes fall back to buffered I/O without O_DIRECT."""
+        pretest = DiskPretest('/dev/sdb', MEGABYTE, quiet=True)
+        fd = pretest._direct_opener('/dev/sdb', os.O_WRONLY)
+
+        self.assertEqual(fd, 5)
+        self.assertFalse(pretest._direct_io)
+        self.assertEqual(mock_os_open.call_args_list, [
+            call('/dev/sdb', os.O_WRONLY | os.O_DIRECT),
+            call('/dev/sdb', os.O_WRONLY)])
+
     @patch('device_detector.DeviceDetector.get_block_device_size')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_run_pretest(self, mock_time, mock_fsync, mock_file,
                          mock_get_size):
         """Test run_pretest method."""
@@ -160,7 +248,7 @@ class TestPretestExecution(unittest.TestCase):
     @patch('device_detector.DeviceDetector.get_block_device_size')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_run_pretest_with_output(self, mock_time, mock_fsync, mock_file,
                                      mock_get_size):
         """Test run_pretest with console output."""
@@ -196,7 +284,7 @@ class TestPretestExecution(unittest.TestCase):
     @patch('device_detector.DeviceDetector.get_block_device_size')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_get_recommendation_after_test(self, mock_time, mock_fsync,
                                            mock_file, mock_get_size):
         """Test get_recommendation after running pretest."""
@@ -308,10 +396,16 @@ class TestAlgorithmRecommendation(unittest.TestCase):
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete workflow."""
 
+    def setUp(self):
+        """Record probe writes and cache advice instead of issuing them."""
+        self.mock_pwrite = start_patch(self, patch('disk_pretest.os.pwrite'))
+        self.mock_fadvise = start_patch(
+            self, patch('disk_pretest.os.posix_fadvise'))
+
     @patch('device_detector.DeviceDetector.get_block_device_size')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_full_pretest_workflow(self, mock_time, mock_fsync, mock_file,
                                    mock_get_size):
         """Test complete pretest workflow."""
@@ -340,7 +434,7 @@ class TestIntegration(unittest.TestCase):
     @patch('device_detector.DeviceDetector.get_block_device_size')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.perf_counter')
     def test_result_dict_format(self, mock_time, mock_fsync,
                                 mock_file, mock_get_size):
         """Test results dictionary contains all required fields."""
@@ -373,23 +467,4 @@ class TestIntegration(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    test_suite = unittest.TestSuite()
-
-    test_classes = [
-        TestPretestResults,
-        TestDiskPretest,
-        TestPretestExecution,
-        TestAnalysis,
-        TestAlgorithmRecommendation,
-        TestIntegration,
-    ]
-
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        test_suite.addTests(tests)
-
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
-
-    import sys
-    sys.exit(0 if result.wasSuccessful() else 1)
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the mount safety check in wipeit.main.
+"""
+
+import unittest
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, call, patch
+
+# Import modules from the same directory
+import wipeit
+from global_constants import TEST_CHUNK_SIZE_100MB
+from wipeit_test_helpers import (
+    ROOT_EUID,
+    discard_stdout,
+    run_as,
+    start_patch,
+)
+
+
+class TestMainMountSafety(unittest.TestCase):
+    """Test the mount safety check performed by main()."""
+
+    def setUp(self):
+        """Patch main() up to and including the mount check."""
+        self.args = SimpleNamespace(device='/dev/sdb', buffer_size='100M',
+                                    resume=False, skip_pretest=False,
+                                    list=False, zero_out=False,
+                                    secure_discard=False, yes=False)
+        start_patch(self, patch.multiple(
+            'wipeit',
+            display_resume_info=MagicMock(return_value=False),
+            load_progress=MagicMock(return_value=None),
+            parse_size=MagicMock(return_value=TEST_CHUNK_SIZE_100MB)))
+        self.detector_mocks = start_patch(self, patch.multiple(
+            'wipeit.DeviceDetector', display_info=DEFAULT,
+            is_mounted=DEFAULT))
+        start_patch(self, patch.object(wipeit._PARSER, 'parse_args',
+                                       return_value=self.args))
+        start_patch(self, run_as(ROOT_EUID))
+        start_patch(self, patch('os.path.exists', return_value=True))
+        self.mock_input = start_patch(self, patch('builtins.input',
+                                                  return_value='n'))
+
+    def test_main_mount_safety_check_mounted(self):
+        """Test that main function exits when device is mounted."""
+        self.detector_mocks['is_mounted'].return_value = (
+            True, ['/dev/sdb1 -> /mnt/usb'])
+
+        with discard_stdout(), self.assertRaises(SystemExit) as cm:
+            wipeit.main()
+
+        self.assertEqual(cm.exception.code, 1)
+        self.assertEqual(self.detector_mocks['is_mounted'].mock_calls,
+                         [call()])
+
+    def test_main_mount_safety_check_lists_umount_commands(self):
+        """Test that the mount error names each partition to unmount."""
+        self.detector_mocks['is_mounted'].return_value = (
+            True, ['/dev/sdb1 -> /mnt/usb', '/dev/sdb2 -> /mnt/data'])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                self.assertRaises(SystemExit):
+            wipeit.main()
+
+        output = mock_stdout.getvalue()
+        self.assertIn("sudo umount /dev/sdb*", output)
+        self.assertIn("sudo umount /dev/sdb1\n", output)
+        self.assertIn("sudo umount /dev/sdb2\n", output)
+
+    def test_main_mount_safety_check_swapoff_and_unknown(self):
+        """Test swap gets swapoff and an unchecked device no command."""
+        self.detector_mocks['is_mounted'].return_value = (
+            True, ['/dev/sdb2 -> [SWAP]', 'Could not check mount status: x'])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                self.assertRaises(SystemExit) as cm:
+            wipeit.main()
+
+        output = mock_stdout.getvalue()
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("sudo swapoff /dev/sdb2\n", output)
+        self.assertNotIn("sudo umount /dev/sdb2", output)
+        self.assertNotIn("sudo umount Could", output)
+
+    def test_main_mount_safety_check_not_mounted(self):
+        """Test that main function continues when device is not mounted."""
+        self.detector_mocks['is_mounted'].return_value = (False, [])
+
+        with discard_stdout(), self.assertRaises(SystemExit) as cm:
+            wipeit.main()
+
+        # Proceeded past the mount check and stopped at the user abort
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(self.detector_mocks['is_mounted'].mock_calls,
+                         [call()])
+
+    @patch('wipeit.wipe_device')
+    def test_main_yes_still_refuses_mounted_device(self, mock_wipe):
+        """Test --yes skips the prompt but not the mount check."""
+        self.args.yes = True
+        self.detector_mocks['is_mounted'].return_value = (
+            True, ['/dev/sdb1 -> /mnt/usb'])
+
+        with discard_stdout(), self.assertRaises(SystemExit) as cm:
+            wipeit.main()
+
+        self.assertEqual(cm.exception.code, 1)
+        mock_wipe.assert_not_called()
+
+    @patch('wipeit.signal.signal')
+    @patch('wipeit.clear_progress')
+    @patch('wipeit.wipe_device')
+    def test_main_yes_skips_confirmation(self, mock_wipe, mock_clear,
+                                         mock_signal):
+        """Test --yes starts the wipe without reading a confirmation."""
+        self.args.yes = True
+        self.detector_mocks['is_mounted'].return_value = (False, [])
+
+        with discard_stdout():
+            wipeit.main()
+
+        self.mock_input.assert_not_called()
+        mock_wipe.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for wipeit.parse_size - buffer size parsing.
+"""
+
+import unittest
+
+# Import modules from the same directory
+import wipeit
+from global_constants import (
+    GIGABYTE,
+    MEGABYTE,
+    TERABYTE,
+)
+
+
+class TestParseSize(unittest.TestCase):
+    """Test the parse_size function for buffer size parsing."""
+
+    VALID_SIZES = (
+        ('1M', MEGABYTE),
+        ('100M', 100 * MEGABYTE),
+        ('1G', GIGABYTE),
+        ('500M', 500 * MEGABYTE),
+        ('1T', TERABYTE),
+        ('0.5G', int(0.5 * GIGABYTE)),
+        ('2.5G', int(2.5 * GIGABYTE)),
+        ('.5G', int(0.5 * GIGABYTE)),
+    )
+
+    INVALID_SIZES = (
+        '500K',  # Wrong suffix
+        '2T',    # Too large
+        '0.5M',  # Too small
+        'ABC',   # Not a number
+        '100',   # No suffix
+        '100MB',  # Wrong suffix format
+        '1.5.2G',  # Invalid decimal
+    )
+
+    def test_case_insensitive(self):
+        """Test that size parsing is case insensitive."""
+        self.assertEqual(wipeit.parse_size('1m'), MEGABYTE)
+        self.assertEqual(wipeit.parse_size('1g'), GIGABYTE)
+        self.assertEqual(wipeit.parse_size('1t'), TERABYTE)
+
+    def test_surrounding_whitespace(self):
+        """Test whitespace around the number and suffix is ignored."""
+        self.assertEqual(wipeit.parse_size(' 2 g '), 2 * GIGABYTE)
+
+    def test_empty_string(self):
+        """Test that empty string raises ValueError."""
+        with self.assertRaises(ValueError):
+            wipeit.parse_size('')
+
+    def test_error_messages(self):
+        """Test bad numbers and missing suffixes get distinct messages."""
+        with self.assertRaisesRegex(ValueError, 'Invalid size format'):
+            wipeit.parse_size('1.5.2G')
+        with self.assertRaisesRegex(ValueError, 'must end with M, G, or T'):
+            wipeit.parse_size('100')
+
+    def test_boundary_values(self):
+        """Test boundary values (1M minimum, 1T maximum)."""
+        # Test minimum valid size
+        self.assertEqual(wipeit.parse_size('1M'), MEGABYTE)
+
+        # Test maximum valid size
+        self.assertEqual(wipeit.parse_size('1T'), TERABYTE)
+
+        # Test just under minimum
+        with self.assertRaises(ValueError):
+            wipeit.parse_size('0.9M')
+
+        # Test just over maximum
+        with self.assertRaises(ValueError):
+            wipeit.parse_size('1.1T')
+
+
+def _size_test_id(size_str):
+    """Turn a size string into a valid test method name suffix."""
+    return size_str.replace('.', '_')
+
+
+def _make_valid_size_test(size_str, expected):
+    """Build a test asserting size_str parses to expected bytes."""
+    def test(self):
+        self.assertEqual(wipeit.parse_size(size_str), expected)
+    test.__doc__ = f"Test parsing of valid size string {size_str!r}."
+    return test
+
+
+def _make_invalid_size_test(size_str):
+    """Build a test asserting size_str is rejected with ValueError."""
+    def test(self):
+        with self.assertRaises(ValueError):
+            wipeit.parse_size(size_str)
+    test.__doc__ = f"Test that size string {size_str!r} raises ValueError."
+    return test
+
+
+# One independent test per case, so each size is reported and selectable
+# on its own (e.g. -k test_valid_size_0_5G).
+for _size_str, _expected in TestParseSize.VALID_SIZES:
+    setattr(TestParseSize, f'test_valid_size_{_size_test_id(_size_str)}',
+            _make_valid_size_test(_size_str, _expected))
+
+for _size_str in TestParseSize.INVALID_SIZES:
+    setattr(TestParseSize, f'test_invalid_size_{_size_test_id(_size_str)}',
+            _make_invalid_size_test(_size_str))
+
+
+if __name__ == '__main__':
+    unittest.main()
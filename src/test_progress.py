@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Unit tests for wipeit progress and resume file handling.
+"""
+
+import json
+import os
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, call, patch
+
+# Import modules from the same directory
+import wipeit
+from global_constants import (
+    GIGABYTE,
+    TEST_CHUNK_SIZE_100MB,
+    TEST_TIMESTAMP_2024_01_01,
+    TEST_TOTAL_SIZE_4GB,
+    TEST_WRITTEN_1GB,
+)
+from wipeit_test_helpers import (
+    TempCwdTestCase,
+    write_progress,
+)
+
+
+class TestProgressFileFunctions(TempCwdTestCase):
+    """Test progress file management functions."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.test_device = '/dev/sdb'
+
+    def test_progress_file_constant(self):
+        """Test PROGRESS_FILE_NAME constant is defined correctly."""
+        from global_constants import PROGRESS_FILE_NAME
+
+        # Should be the expected filename
+        self.assertEqual(PROGRESS_FILE_NAME, 'wipeit_progress.json')
+
+    def test_save_progress(self):
+        """Test saving progress to file."""
+        written = TEST_WRITTEN_1GB  # 1GB
+        total_size = TEST_TOTAL_SIZE_4GB  # 4GB
+        chunk_size = TEST_CHUNK_SIZE_100MB  # 100MB
+
+        with patch('wipeit.time.time',
+                   return_value=TEST_TIMESTAMP_2024_01_01):
+            wipeit.save_progress(self.test_device, written, total_size,
+                                 chunk_size)
+
+        # Check that file was created
+        self.assertTrue(os.path.exists(self.test_progress_file))
+
+        # Check file contents
+        with open(self.test_progress_file, 'r') as f:
+            data = json.load(f)
+
+        self.assertEqual(data['device'], self.test_device)
+        self.assertEqual(data['written'], written)
+        self.assertEqual(data['total_size'], total_size)
+        self.assertEqual(data['chunk_size'], chunk_size)
+        self.assertEqual(data['progress_percent'], 25.0)
+        self.assertEqual(data['timestamp'], TEST_TIMESTAMP_2024_01_01)
+
+    def test_save_progress_failure_keeps_previous_file(self):
+        """Test a failed save leaves the previous checkpoint intact."""
+        wipeit.save_progress(self.test_device, 1024, 4096, 100)
+
+        with patch('wipeit.os.write', side_effect=OSError("disk full")), \
+                patch('builtins.print'):
+            wipeit.save_progress(self.test_device, 2048, 4096, 100)
+
+        with open(self.test_progress_file, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data['written'], 1024)
+
+    def test_save_progress_leaves_no_temp_file(self):
+        """Test the temp file is renamed over the progress file."""
+        wipeit.save_progress(self.test_device, 1024, 4096, 100)
+
+        self.assertEqual(os.listdir('.'), [self.test_progress_file])
+
+    def test_save_progress_is_compact(self):
+        """Test checkpoints are written without indentation."""
+        wipeit.save_progress(self.test_device, 1024, 4096, 100)
+
+        with open(self.test_progress_file, 'r') as f:
+            content = f.read()
+        self.assertNotIn('\n', content)
+        self.assertNotIn(': ', content)
+
+    def test_load_progress(self):
+        """Test loading progress from file."""
+        # Create a test progress file
+        write_progress(self.test_progress_file, device=self.test_device)
+
+        # Test loading
+        result = wipeit.load_progress(self.test_device)
+        self.assertIsNotNone(result)
+        self.assertEqual(result['device'], self.test_device)
+        self.assertEqual(result['written'], TEST_WRITTEN_1GB)
+
+    def test_load_progress_nonexistent(self):
+        """Test loading progress from nonexistent file."""
+        result = wipeit.load_progress('/dev/nonexistent')
+        self.assertIsNone(result)
+
+    def test_clear_progress(self):
+        """Test clearing progress file."""
+        # Create a test progress file
+        wipeit.save_progress(self.test_device, 1024, 4096, 100)
+        self.assertTrue(os.path.exists(self.test_progress_file))
+
+        # Clear it
+        wipeit.clear_progress()
+        self.assertFalse(os.path.exists(self.test_progress_file))
+
+    def test_clear_progress_nonexistent(self):
+        """Test clearing nonexistent progress file."""
+        # Should not raise an exception
+        wipeit.clear_progress()
+
+    def test_progress_percent_calculation(self):
+        """Test that progress_percent is correctly calculated when saving."""
+        test_cases = [
+            (0, TEST_TOTAL_SIZE_4GB, 0.0, "0% progress"),
+            (TEST_TOTAL_SIZE_4GB // 4, TEST_TOTAL_SIZE_4GB,
+             25.0, "25% progress"),
+            (TEST_TOTAL_SIZE_4GB // 2, TEST_TOTAL_SIZE_4GB,
+             50.0, "50% progress"),
+            (3 * TEST_TOTAL_SIZE_4GB // 4, TEST_TOTAL_SIZE_4GB,
+             75.0, "75% progress"),
+            (TEST_TOTAL_SIZE_4GB, TEST_TOTAL_SIZE_4GB,
+             100.0, "100% progress"),
+            (50 * GIGABYTE, 100 * GIGABYTE, 50.0, "50GB/100GB"),
+            (1 * GIGABYTE, 10 * GIGABYTE, 10.0, "1GB/10GB"),
+        ]
+
+        for written, total, expected_percent, description in test_cases:
+            with self.subTest(case=description):
+                wipeit.save_progress(
+                    self.test_device, written, total, TEST_CHUNK_SIZE_100MB)
+
+                with open(self.test_progress_file, 'r') as f:
+                    data = json.load(f)
+
+                self.assertAlmostEqual(
+                    data['progress_percent'], expected_percent, places=2,
+                    msg=f"Progress percent mismatch for {description}: "
+                    f"expected {expected_percent}%, "
+                    f"got {data['progress_percent']}%")
+
+                # Also verify written and total_size are saved correctly
+                self.assertEqual(
+                    data['written'], written,
+                    msg=f"Written bytes mismatch for {description}")
+                self.assertEqual(
+                    data['total_size'], total,
+                    msg=f"Total size mismatch for {description}")
+
+    def test_save_progress_with_device_id(self):
+        """Test saving progress with device unique identifier."""
+        device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+
+        wipeit.save_progress(
+            self.test_device, TEST_WRITTEN_1GB, TEST_TOTAL_SIZE_4GB,
+            TEST_CHUNK_SIZE_100MB, None, device_id)
+
+        with open(self.test_progress_file, 'r') as f:
+            data = json.load(f)
+
+        self.assertIn('device_id', data)
+        self.assertEqual(data['device_id']['serial'], 'TEST123456')
+        self.assertEqual(data['device_id']['model'], 'TestDrive_Model')
+        self.assertEqual(data['device_id']['size'], TEST_TOTAL_SIZE_4GB)
+
+    @patch('wipeit.DeviceDetector')
+    def test_load_progress_verifies_device_id(self, mock_detector_class):
+        """Test that load_progress verifies device identity."""
+        device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+
+        # Create progress file with device_id
+        write_progress(self.test_progress_file,
+                       device=self.test_device,
+                       device_id=device_id)
+
+        # Mock DeviceDetector to return matching ID
+        mock_detector = MagicMock()
+        mock_detector.get_unique_id.return_value = device_id
+        mock_detector_class.return_value = mock_detector
+
+        # Should load successfully
+        result = wipeit.load_progress(self.test_device)
+        self.assertIsNotNone(result)
+        self.assertEqual(result['device_id']['serial'], 'TEST123456')
+
+    @patch('wipeit.sys.exit')
+    @patch('wipeit.DeviceDetector')
+    def test_load_progress_rejects_mismatched_serial(
+            self, mock_detector_class, mock_exit):
+        """Test that load_progress halts on mismatched serial number."""
+        saved_device_id = {
+            'serial': 'ORIGINAL123',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+
+        current_device_id = {
+            'serial': 'DIFFERENT456',  # Different serial!
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+
+        # Create progress file with original device_id
+        write_progress(self.test_progress_file,
+                       device=self.test_device,
+                       device_id=saved_device_id)
+
+        # Mock DeviceDetector to return different serial
+        mock_detector = MagicMock()
+        mock_detector.get_unique_id.return_value = current_device_id
+        mock_detector_class.return_value = mock_detector
+
+        # Capture output to verify error message
+        with patch('builtins.print') as mock_print:
+            wipeit.load_progress(self.test_device)
+
+        # Should call sys.exit(1) to halt execution
+        self.assertEqual(mock_exit.mock_calls, [call(1)])
+
+        # Verify error message was displayed
+        output = ' '.join([str(printed)
+                           for printed in mock_print.call_args_list])
+        self.assertIn('DEVICE MISMATCH ERROR', output)
+        self.assertIn('ORIGINAL123', output)
+        self.assertIn('DIFFERENT456', output)
+        self.assertIn('WHAT TO DO', output)
+
+    @patch('wipeit.sys.exit')
+    @patch('wipeit.DeviceDetector')
+    def test_load_progress_rejects_mismatched_size(
+            self, mock_detector_class, mock_exit):
+        """Test that load_progress halts on mismatched device size."""
+        saved_device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB
+        }
+
+        current_device_id = {
+            'serial': 'TEST123456',
+            'model': 'TestDrive_Model',
+            'size': TEST_TOTAL_SIZE_4GB * 2  # Different size!
+        }
+
+        # Create progress file
+        write_progress(self.test_progress_file,
+                       device=self.test_device,
+                       device_id=saved_device_id)
+
+        # Mock DeviceDetector to return different size
+        mock_detector = MagicMock()
+        mock_detector.get_unique_id.return_value = current_device_id
+        mock_detector_class.return_value = mock_detector
+
+        # Capture output to verify error message
+        with patch('builtins.print') as mock_print:
+            wipeit.load_progress(self.test_device)
+
+        # Should call sys.exit(1) to halt execution
+        self.assertEqual(mock_exit.mock_calls, [call(1)])
+
+        # Verify error message was displayed
+        output = ' '.join([str(printed)
+                           for printed in mock_print.call_args_list])
+        self.assertIn('DEVICE MISMATCH ERROR', output)
+        self.assertIn('size does not match', output)
+        self.assertIn('WHAT TO DO', output)
+
+
+class TestResumeFileFunctions(TempCwdTestCase):
+    """Test resume file detection and display functions."""
+
+    def test_find_resume_file_none(self):
+        """Test finding resume file when none exist."""
+        result = wipeit.find_resume_file()
+        self.assertIsNone(result)
+
+    def test_find_resume_file_with_valid_file(self):
+        """Test finding resume file with valid file."""
+        # Create test progress file
+        write_progress(self.test_progress_file)
+
+        result = wipeit.find_resume_file()
+        self.assertIsNotNone(result)
+        self.assertEqual(result['device'], '/dev/sdb')
+
+    def test_display_resume_info_no_files(self):
+        """Test display_resume_info with no resume files."""
+        result = wipeit.display_resume_info()
+        self.assertFalse(result)
+
+    def test_display_resume_info_with_files(self):
+        """Test display_resume_info with resume files."""
+        # Create test progress file
+        write_progress(self.test_progress_file)
+
+        # Capture output
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            result = wipeit.display_resume_info()
+
+        self.assertTrue(result)
+        output = mock_stdout.getvalue()
+        self.assertIn('Found previous wipe session', output)
+        self.assertIn('/dev/sdb', output)
+        self.assertIn('25.00% complete', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
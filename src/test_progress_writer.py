@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unit tests for progress_writer - background progress saving.
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock, call
+
+from progress_writer import ProgressWriter
+
+
+class TestProgressWriter(unittest.TestCase):
+    """Test ProgressWriter class."""
+
+    def test_submit_saves_on_background_thread(self):
+        """Test a submitted checkpoint is saved off the calling thread."""
+        threads = []
+        save = Mock(side_effect=lambda *args: threads.append(
+            threading.current_thread()))
+
+        with ProgressWriter(save) as writer:
+            writer.submit('/dev/sdb', 100)
+
+        self.assertEqual(save.mock_calls, [call('/dev/sdb', 100)])
+        self.assertNotEqual(threads, [threading.current_thread()])
+
+    def test_newer_checkpoint_replaces_pending(self):
+        """Test only the latest checkpoint is saved while one is running."""
+        started = threading.Event()
+        release = threading.Event()
+        saved = []
+
+        def slow_save(written):
+            saved.append(written)
+            started.set()
+            release.wait()
+
+        with ProgressWriter(slow_save) as writer:
+            writer.submit(1)
+            started.wait()
+            writer.submit(2)
+            writer.submit(3)
+            release.set()
+
+        self.assertEqual(saved, [1, 3])
+
+    def test_close_without_submit(self):
+        """Test closing an idle writer saves nothing and stops the thread."""
+        save = Mock()
+
+        with ProgressWriter(save) as writer:
+            pass
+
+        save.assert_not_called()
+        self.assertFalse(writer._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
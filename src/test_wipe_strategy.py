@@ -3,11 +3,24 @@
 Unit tests for wipe_strategy - Strategy pattern for wiping algorithms.
 """
 
+import errno
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
 import time
 import unittest
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock, call, mock_open, patch
 
 from global_constants import (
+    ADAPTIVE_MAX_CHUNK_SIZE,
+    ADAPTIVE_MIN_CHUNK_SIZE,
+    ADAPTIVE_SPEED_SMOOTHING,
+    ADAPTIVE_TARGET_CHUNK_SECONDS,
+    BLKSECDISCARD,
+    BLKZEROOUT,
+    DIRECT_IO_ALIGNMENT,
     GIGABYTE,
     MAX_SMALL_CHUNK_SIZE,
     MEGABYTE,
@@ -18,12 +31,30 @@ from global_constants import (
 )
 from wipe_strategy import (
     AdaptiveStrategy,
+    SecureDiscardStrategy,
     SmallChunkStrategy,
     StandardStrategy,
     WipeStrategy,
+    ZeroOutStrategy,
 )
 
 
+class PwriteTestCase(unittest.TestCase):
+    """Base class that replaces os.pwrite for strategies under test."""
+
+    def setUp(self):
+        """Record (length, offset) for each pwrite instead of writing."""
+        self.pwrite_calls = []
+
+        def fake_pwrite(fd, data, offset):
+            self.pwrite_calls.append((len(data), offset))
+            return len(data)
+
+        patcher = patch('wipe_strategy.os.pwrite', side_effect=fake_pwrite)
+        self.mock_pwrite = patcher.start()
+        self.addCleanup(patcher.stop)
+
+
 class TestWipeStrategyBase(unittest.TestCase):
     """Test WipeStrategy abstract base class."""
 
@@ -37,7 +68,7 @@ class TestWipeStrategyBase(unittest.TestCase):
         strategy = StandardStrategy('/dev/sdb', 1000 * MEGABYTE,
                                     100 * MEGABYTE, 0)
         strategy.written = 250 * MEGABYTE
-        strategy.start_time = time.time() - 100
+        strategy.start_time = time.monotonic() - 100
 
         eta_str = strategy._calculate_eta()
 
@@ -104,9 +135,76 @@ class TestWipeStrategyBase(unittest.TestCase):
 
         strategy._save_progress_checkpoint()
 
+    @patch('wipe_strategy.time.monotonic', return_value=0.0)
+    @patch('builtins.print')
+    def test_progress_line_rate_limited(self, mock_print, mock_monotonic):
+        """Test the progress line is redrawn at most once per interval."""
+        strategy = StandardStrategy('/dev/sdb', 1000 * MEGABYTE,
+                                    MEGABYTE, 0)
+
+        for written, now in ((1, 10.0), (2, 10.5), (3, 11.0), (4, 11.2)):
+            mock_monotonic.return_value = now
+            strategy.written = written * MEGABYTE
+            strategy._display_progress()
+
+        self.assertEqual(mock_print.call_count, 2)
+
+    @patch('wipe_strategy.time.monotonic', return_value=10.0)
+    @patch('builtins.print')
+    def test_skipped_redraw_does_no_formatting(self, mock_print,
+                                               mock_monotonic):
+        """Test a throttled call returns before computing ETA or the bar."""
+        strategy = StandardStrategy('/dev/sdb', 1000 * MEGABYTE,
+                                    MEGABYTE, 0)
+        strategy.written = MEGABYTE
+        strategy._display_progress()
+
+        with patch.object(strategy, '_calculate_eta') as mock_eta, \
+                patch.object(strategy, '_format_progress_bar') as mock_bar:
+            strategy.written = 2 * MEGABYTE
+            strategy._display_progress()
+
+        mock_eta.assert_not_called()
+        mock_bar.assert_not_called()
+        self.assertEqual(mock_print.call_count, 1)
+
+    @patch('wipe_strategy.time.monotonic', return_value=49.0)
+    @patch('builtins.print')
+    def test_milestone_reached_on_exact_boundary(self, mock_print,
+                                                 mock_monotonic):
+        """Test a milestone is hit exactly at its byte offset."""
+        strategy = StandardStrategy('/dev/sdb', 20 * MEGABYTE, MEGABYTE, 0)
+        strategy.start_time = 0.0
+        strategy._last_display = 48.5
+        strategy.written = 7 * MEGABYTE - 1
+        strategy._display_progress()
+        self.assertEqual(strategy.last_milestone, 30)
+
+        strategy.written = 7 * MEGABYTE  # Exactly 35%
+
+        strategy._display_progress()
+
+        self.assertEqual(strategy.last_milestone, 35)
+
+    @patch('wipe_strategy.time.monotonic', return_value=10.0)
+    @patch('builtins.print')
+    def test_progress_line_always_drawn_on_final_chunk(self, mock_print,
+                                                       mock_monotonic):
+        """Test the last chunk always redraws the progress line."""
+        strategy = StandardStrategy('/dev/sdb', 1000 * MEGABYTE,
+                                    MEGABYTE, 0)
+        strategy.written = MEGABYTE
+        strategy._display_progress()
+        mock_print.reset_mock()
+
+        strategy.written = 1000 * MEGABYTE
+        strategy._display_progress()
+
+        self.assertIn("100.0%", mock_print.call_args_list[0].args[0])
+
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     def test_milestone_tracking(self, mock_print, mock_time,
                                 mock_localtime, mock_strftime):
@@ -131,7 +229,7 @@ class TestWipeStrategyBase(unittest.TestCase):
             "Estimated finish time should be shown at milestone")
 
     @patch('time.strftime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     def test_milestone_not_shown_twice(self, mock_print, mock_time,
                                        mock_strftime):
@@ -161,7 +259,7 @@ class TestWipeStrategyBase(unittest.TestCase):
 
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     def test_milestone_increments_correctly(
             self, mock_print, mock_time, mock_localtime, mock_strftime):
@@ -189,7 +287,7 @@ class TestWipeStrategyBase(unittest.TestCase):
 
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_estimated_finish_time_format(self, mock_time,
                                           mock_localtime, mock_strftime):
         """Test estimated finish time formatting."""
@@ -253,7 +351,7 @@ class TestWipeStrategyBase(unittest.TestCase):
 
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     def test_milestone_not_repeated_after_resume(
             self, mock_print, mock_time, mock_localtime, mock_strftime):
@@ -292,7 +390,7 @@ class TestWipeStrategyBase(unittest.TestCase):
         self.assertEqual(strategy.last_milestone, 50)
 
 
-class TestStandardStrategy(unittest.TestCase):
+class TestStandardStrategy(PwriteTestCase):
     """Test StandardStrategy class."""
 
     def test_init(self):
@@ -322,7 +420,7 @@ class TestStandardStrategy(unittest.TestCase):
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_wipe_small_device(self, mock_time, mock_fsync, mock_file):
         """Test wiping a small device."""
         device_size = 10 * MEGABYTE
@@ -338,11 +436,13 @@ class TestStandardStrategy(unittest.TestCase):
 
         self.assertTrue(result)
         self.assertEqual(strategy.written, device_size)
-        self.assertEqual(mock_file.call_count, 2)
+        # Device opened once for the whole pass, not once per chunk
+        self.assertEqual(mock_file.call_count, 1)
+        self.assertEqual(len(self.pwrite_calls), 2)
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_wipe_respects_chunk_size(self, mock_time, mock_fsync, mock_file):
         """Test that wipe uses correct chunk sizes."""
         device_size = 25 * MEGABYTE
@@ -352,24 +452,17 @@ class TestStandardStrategy(unittest.TestCase):
         mock_file_handle = mock_file.return_value.__enter__.return_value
         mock_file_handle.fileno.return_value = 3
 
-        written_chunks = []
-
-        def capture_write(data):
-            written_chunks.append(len(data))
-
-        mock_file_handle.write = capture_write
-
         strategy = StandardStrategy('/dev/sdb', device_size, chunk_size, 0)
         strategy.wipe()
 
-        self.assertEqual(len(written_chunks), 3)
-        self.assertEqual(written_chunks[0], 10 * MEGABYTE)
-        self.assertEqual(written_chunks[1], 10 * MEGABYTE)
-        self.assertEqual(written_chunks[2], 5 * MEGABYTE)
+        self.assertEqual(self.pwrite_calls, [(10 * MEGABYTE, 0),
+                                             (10 * MEGABYTE, 10 * MEGABYTE),
+                                             (5 * MEGABYTE, 20 * MEGABYTE)])
 
+    @patch('wipe_strategy.PROGRESS_SYNC_INTERVAL', 0)
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_wipe_with_progress_callback(self, mock_time, mock_fsync,
                                          mock_file):
         """Test wipe calls progress callback at milestones."""
@@ -390,9 +483,27 @@ class TestStandardStrategy(unittest.TestCase):
         expected_callbacks = device_size // PROGRESS_SAVE_THRESHOLD
         self.assertEqual(callback.call_count, expected_callbacks)
 
+    @patch('wipe_strategy.PROGRESS_SYNC_INTERVAL', 0)
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('builtins.print')
+    def test_wipe_saves_with_non_divisor_chunk_size(self, mock_print,
+                                                    mock_fsync, mock_file):
+        """Test checkpoints keep a steady cadence for odd chunk sizes."""
+        chunk_size = 30 * MEGABYTE  # Does not divide the save threshold
+        callback = Mock()
+        strategy = StandardStrategy('/dev/sdb', 12 * chunk_size,
+                                    chunk_size, 0, progress_callback=callback)
+
+        strategy.wipe()
+
+        saved_at = [c.args[0] for c in callback.call_args_list]
+        self.assertEqual(saved_at, [4 * chunk_size, 8 * chunk_size,
+                                    12 * chunk_size])
+
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('os.fsync')
+    @patch('time.monotonic')
     def test_wipe_resume_from_position(self, mock_time, mock_fsync,
                                        mock_file):
         """Test wiping can resume from a position."""
@@ -410,9 +521,25 @@ class TestStandardStrategy(unittest.TestCase):
         strategy.wipe()
 
         self.assertEqual(strategy.written, device_size)
+        self.assertEqual(self.pwrite_calls, [(chunk_size, start_pos)])
+
+    def test_short_pwrite_is_retried(self):
+        """Test a short write continues from where the kernel stopped."""
+        offsets = []
+
+        def short_pwrite(fd, data, offset):
+            offsets.append(offset)
+            return min(len(data), 1000)
+
+        self.mock_pwrite.side_effect = short_pwrite
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 0)
+
+        strategy._pwrite_all(Mock(), bytes(2500), 4096)
 
+        self.assertEqual(offsets, [4096, 5096, 6096])
 
-class TestSmallChunkStrategy(unittest.TestCase):
+
+class TestSmallChunkStrategy(PwriteTestCase):
     """Test SmallChunkStrategy class."""
 
     def test_init_limits_chunk_size(self):
@@ -440,7 +567,7 @@ class TestSmallChunkStrategy(unittest.TestCase):
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_wipe_uses_small_chunks(self, mock_time, mock_fsync, mock_file):
         """Test SmallChunkStrategy uses limited chunk sizes."""
         device_size = 30 * MEGABYTE
@@ -450,22 +577,16 @@ class TestSmallChunkStrategy(unittest.TestCase):
         mock_file_handle = mock_file.return_value.__enter__.return_value
         mock_file_handle.fileno.return_value = 3
 
-        written_chunks = []
-
-        def capture_write(data):
-            written_chunks.append(len(data))
-
-        mock_file_handle.write = capture_write
-
         strategy = SmallChunkStrategy('/dev/sdb', device_size,
                                       requested_chunk, 0)
         strategy.wipe()
 
+        written_chunks = [length for length, _ in self.pwrite_calls]
         for chunk_size in written_chunks[:-1]:
             self.assertLessEqual(chunk_size, MAX_SMALL_CHUNK_SIZE)
 
 
-class TestAdaptiveStrategy(unittest.TestCase):
+class TestAdaptiveStrategy(PwriteTestCase):
     """Test AdaptiveStrategy class."""
 
     def test_init(self):
@@ -476,7 +597,7 @@ class TestAdaptiveStrategy(unittest.TestCase):
         self.assertEqual(strategy.device_path, '/dev/sdb')
         self.assertEqual(strategy.total_size, TEST_DEVICE_SIZE_100GB)
         self.assertEqual(strategy.chunk_size, TEST_CHUNK_SIZE_100MB)
-        self.assertEqual(len(strategy._speed_samples), 0)
+        self.assertIsNone(strategy._speed_estimate)
 
     def test_get_strategy_name(self):
         """Test AdaptiveStrategy name."""
@@ -485,96 +606,77 @@ class TestAdaptiveStrategy(unittest.TestCase):
 
         self.assertEqual(strategy.get_strategy_name(), "adaptive_chunk")
 
-    def test_calculate_adaptive_chunk_beginning(self):
-        """Test adaptive chunk size at beginning (0-10%)."""
+    def test_calculate_adaptive_chunk_no_samples(self):
+        """Test the first chunk uses the base chunk size."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 5 * GIGABYTE
+        strategy.written = 50 * GIGABYTE
 
         chunk_size = strategy._calculate_adaptive_chunk_size()
 
-        expected = int(TEST_CHUNK_SIZE_100MB * 2)
-        self.assertEqual(chunk_size, expected)
+        self.assertEqual(chunk_size, TEST_CHUNK_SIZE_100MB)
         self.assertIsInstance(chunk_size, int)
 
-    def test_calculate_adaptive_chunk_end(self):
-        """Test adaptive chunk size at end (90-100%)."""
+    def test_calculate_adaptive_chunk_targets_duration(self):
+        """Test chunks are sized to take the target time at the speed."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 95 * GIGABYTE
-
-        chunk_size = strategy._calculate_adaptive_chunk_size()
-
-        expected = int(TEST_CHUNK_SIZE_100MB * 0.5)
-        self.assertEqual(chunk_size, expected)
-        self.assertIsInstance(chunk_size, int)
+        for speed in (30, 120, 200):
+            with self.subTest(speed=speed):
+                strategy._speed_estimate = speed
+                self.assertEqual(
+                    strategy._calculate_adaptive_chunk_size(),
+                    int(speed * MEGABYTE * ADAPTIVE_TARGET_CHUNK_SECONDS))
 
-    def test_calculate_adaptive_chunk_middle_no_samples(self):
-        """Test adaptive chunk size in middle with no speed samples."""
+    def test_calculate_adaptive_chunk_clamped(self):
+        """Test very slow and very fast drives stay within the bounds."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 50 * GIGABYTE
+        strategy._speed_estimate = 0.5
+        self.assertEqual(strategy._calculate_adaptive_chunk_size(),
+                         ADAPTIVE_MIN_CHUNK_SIZE)
+        strategy._speed_estimate = 5000
+        self.assertEqual(strategy._calculate_adaptive_chunk_size(),
+                         ADAPTIVE_MAX_CHUNK_SIZE)
 
-        chunk_size = strategy._calculate_adaptive_chunk_size()
-
-        self.assertEqual(chunk_size, TEST_CHUNK_SIZE_100MB)
-        self.assertIsInstance(chunk_size, int)
-
-    def test_calculate_adaptive_chunk_middle_slow_speed(self):
-        """Test adaptive chunk size with slow speed samples."""
+    def test_calculate_adaptive_chunk_for_given_position(self):
+        """Test an explicit position overrides the written offset."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 50 * GIGABYTE
-        strategy._speed_samples = [30, 35, 40, 35, 30]
-
-        chunk_size = strategy._calculate_adaptive_chunk_size()
+        chunk_size = strategy._calculate_adaptive_chunk_size(
+            TEST_DEVICE_SIZE_100GB - MEGABYTE)
 
-        expected = int(TEST_CHUNK_SIZE_100MB * 0.5)
-        self.assertEqual(chunk_size, expected)
-        self.assertIsInstance(chunk_size, int)
+        self.assertEqual(chunk_size, MEGABYTE)
+        self.assertEqual(strategy.written, 0)
 
-    def test_calculate_adaptive_chunk_middle_fast_speed(self):
-        """Test adaptive chunk size with fast speed samples."""
+    def test_calculate_adaptive_chunk_stays_block_aligned(self):
+        """Test a speed-derived chunk is rounded to the O_DIRECT alignment."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 50 * GIGABYTE
-        strategy._speed_samples = [250, 260, 255, 265, 270]
+        strategy._speed_estimate = 33.3
 
         chunk_size = strategy._calculate_adaptive_chunk_size()
 
-        expected = int(TEST_CHUNK_SIZE_100MB * 1.5)
-        self.assertEqual(chunk_size, expected)
-        self.assertIsInstance(chunk_size, int)
+        self.assertEqual(chunk_size % DIRECT_IO_ALIGNMENT, 0)
+        self.assertLess(int(33.3 * MEGABYTE) - chunk_size,
+                        DIRECT_IO_ALIGNMENT)
 
-    def test_calculate_adaptive_chunk_middle_medium_speed(self):
-        """Test adaptive chunk size with medium speed samples."""
+    def test_record_speed_smooths_samples(self):
+        """Test the speed estimate is a moving average, not the last value."""
         strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
                                     TEST_CHUNK_SIZE_100MB, 0)
 
-        strategy.written = 50 * GIGABYTE
-        strategy._speed_samples = [100, 110, 105, 115, 120]
+        strategy._record_speed(100)
+        self.assertEqual(strategy._speed_estimate, 100)
 
-        chunk_size = strategy._calculate_adaptive_chunk_size()
-
-        self.assertEqual(chunk_size, TEST_CHUNK_SIZE_100MB)
-        self.assertIsInstance(chunk_size, int)
-
-    def test_adaptive_chunk_respects_min_size(self):
-        """Test adaptive chunk size respects minimum of 1MB."""
-        strategy = AdaptiveStrategy('/dev/sdb', 10 * MEGABYTE, MEGABYTE, 0)
-
-        strategy.written = 9 * MEGABYTE
-        strategy._speed_samples = [10, 15, 12]
-
-        chunk_size = strategy._calculate_adaptive_chunk_size()
-
-        self.assertGreaterEqual(chunk_size, MEGABYTE)
-        self.assertIsInstance(chunk_size, int)
+        strategy._record_speed(200)
+        self.assertAlmostEqual(strategy._speed_estimate,
+                               100 + ADAPTIVE_SPEED_SMOOTHING * 100)
 
     def test_adaptive_chunk_respects_remaining_size(self):
         """Test adaptive chunk doesn't exceed remaining device size."""
@@ -588,35 +690,12 @@ class TestAdaptiveStrategy(unittest.TestCase):
         self.assertLessEqual(chunk_size, 10 * MEGABYTE)
         self.assertIsInstance(chunk_size, int)
 
-    def test_adaptive_chunk_always_returns_int(self):
-        """Test adaptive chunk size always returns integers."""
-        strategy = AdaptiveStrategy('/dev/sdb', TEST_DEVICE_SIZE_100GB,
-                                    TEST_CHUNK_SIZE_100MB, 0)
-
-        test_positions = [
-            0,
-            5 * GIGABYTE,
-            25 * GIGABYTE,
-            50 * GIGABYTE,
-            75 * GIGABYTE,
-            95 * GIGABYTE
-        ]
-
-        for position in test_positions:
-            strategy.written = position
-            strategy._speed_samples = [50, 100, 150, 200, 250]
-
-            chunk_size = strategy._calculate_adaptive_chunk_size()
-
-            with self.subTest(position=position):
-                self.assertIsInstance(chunk_size, int)
-
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
-    def test_wipe_tracks_speed_samples(self, mock_time, mock_fsync,
-                                       mock_file):
-        """Test that adaptive wipe tracks speed samples."""
+    @patch('time.monotonic')
+    def test_wipe_tracks_speed_estimate(self, mock_time, mock_fsync,
+                                        mock_file):
+        """Test that adaptive wipe measures its write speed."""
         device_size = 30 * MEGABYTE
         chunk_size = 10 * MEGABYTE
 
@@ -629,11 +708,11 @@ class TestAdaptiveStrategy(unittest.TestCase):
         strategy = AdaptiveStrategy('/dev/sdb', device_size, chunk_size, 0)
         strategy.wipe()
 
-        self.assertGreater(len(strategy._speed_samples), 0)
+        self.assertGreater(strategy._speed_estimate, 0)
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_wipe_completes_successfully(self, mock_time, mock_fsync,
                                          mock_file):
         """Test that adaptive wipe completes successfully."""
@@ -652,7 +731,366 @@ class TestAdaptiveStrategy(unittest.TestCase):
         self.assertEqual(strategy.written, device_size)
 
 
-class TestStrategyIntegration(unittest.TestCase):
+class TestRealFileWipe(unittest.TestCase):
+    """Test wiping a real file end to end."""
+
+    @patch('builtins.print')
+    def test_wipe_real_file_with_unaligned_tail(self, mock_print):
+        """Test a file is fully written whether or not O_DIRECT works."""
+        size = 2 * MEGABYTE + 512
+        with tempfile.NamedTemporaryFile() as target:
+            target.truncate(size)
+            strategy = StandardStrategy(target.name, size, MEGABYTE, 0)
+
+            self.assertTrue(strategy.wipe())
+
+            self.assertEqual(os.path.getsize(target.name), size)
+            with open(target.name, 'rb') as f:
+                self.assertNotEqual(f.read()[-512:], bytes(512))
+
+    @patch('builtins.print')
+    def test_wipe_resume_writes_only_remaining_range(self, mock_print):
+        """Test a resumed wipe leaves bytes before the offset untouched."""
+        size = 2 * MEGABYTE
+        with tempfile.NamedTemporaryFile() as target:
+            target.truncate(size)
+            strategy = StandardStrategy(target.name, size, MEGABYTE,
+                                        MEGABYTE)
+
+            strategy.wipe()
+
+            with open(target.name, 'rb') as f:
+                data = f.read()
+            self.assertEqual(data[:MEGABYTE], bytes(MEGABYTE))
+            self.assertNotEqual(data[MEGABYTE:], bytes(MEGABYTE))
+
+    @patch('builtins.print')
+    def test_zero_out_falls_back_to_zero_buffer(self, mock_print):
+        """Test ranges are written from one zero buffer without BLKZEROOUT."""
+        size = 2 * MEGABYTE + 512
+        with tempfile.NamedTemporaryFile() as target:
+            target.write(b'\xff' * size)
+            target.flush()
+            strategy = ZeroOutStrategy(target.name, size, MEGABYTE, 0)
+
+            with patch('chunk_producer.os.urandom') as mock_urandom:
+                self.assertTrue(strategy.wipe())
+
+            with open(target.name, 'rb') as f:
+                self.assertEqual(f.read(), bytes(size))
+        mock_urandom.assert_not_called()
+        self.assertEqual(len(strategy._zeros), MEGABYTE)
+
+
+class TestDirectIO(PwriteTestCase):
+    """Test O_DIRECT device writes."""
+
+    @patch('wipe_strategy.os.open', side_effect=[OSError(errno.EINVAL,
+                                                         'EINVAL'), 5])
+    def test_opener_falls_back_without_o_direct(self, mock_os_open):
+        """Test the opener retries without O_DIRECT when it is rejected."""
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 0)
+
+        fd = strategy._direct_opener('/dev/sdb', os.O_WRONLY)
+
+        self.assertEqual(fd, 5)
+        self.assertFalse(strategy._direct_io)
+        self.assertEqual(mock_os_open.call_args_list,
+                         [call('/dev/sdb', os.O_WRONLY | os.O_DIRECT),
+                          call('/dev/sdb', os.O_WRONLY)])
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_unaligned_resume_skips_o_direct(self, mock_file):
+        """Test an unaligned resume offset opens without O_DIRECT."""
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 100)
+
+        strategy._open_device()
+
+        mock_file.assert_called_once_with('/dev/sdb', 'wb', buffering=0,
+                                          opener=None)
+
+    def test_direct_write_from_mmap_in_place(self):
+        """Test page-aligned mmap chunks are written without a copy."""
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 0)
+        strategy._direct_io = True
+        device = Mock()
+        chunk_data = memoryview(mmap.mmap(-1, 2 * DIRECT_IO_ALIGNMENT))
+
+        strategy._write_direct(device, chunk_data)
+
+        self.assertIs(self.mock_pwrite.call_args.args[1].obj, chunk_data.obj)
+
+    def test_direct_write_rejects_unaligned_buffer(self):
+        """Test data outside an mmap is refused rather than staged."""
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 0)
+        strategy._direct_io = True
+
+        with self.assertRaises(AssertionError):
+            strategy._write_direct(Mock(), bytes(DIRECT_IO_ALIGNMENT))
+
+        self.mock_pwrite.assert_not_called()
+
+    @patch('wipe_strategy.fcntl.fcntl', return_value=os.O_WRONLY)
+    def test_direct_write_splits_unaligned_tail(self, mock_fcntl):
+        """Test the aligned head goes direct and the tail goes buffered."""
+        strategy = StandardStrategy('/dev/sdb', MEGABYTE, MEGABYTE, 0)
+        strategy._direct_io = True
+        device = Mock()
+        device.fileno.return_value = 3
+        chunk_data = mmap.mmap(-1, DIRECT_IO_ALIGNMENT + 256)
+        chunk_data[:] = bytes(range(256)) * 17  # 4352 bytes
+
+        strategy._write_direct(device, memoryview(chunk_data))
+
+        self.assertEqual(self.pwrite_calls, [(DIRECT_IO_ALIGNMENT, 0),
+                                             (256, DIRECT_IO_ALIGNMENT)])
+        self.assertFalse(strategy._direct_io)
+        mock_fcntl.assert_called_with(3, fcntl.F_SETFL, os.O_WRONLY)
+
+
+class TestDeviceSync(PwriteTestCase):
+    """Test device syncs and page cache eviction for buffered writes."""
+
+    @patch('wipe_strategy.os.fsync')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_syncs_at_checkpoints_and_end(self, mock_file,
+                                               mock_fsync):
+        """Test the device is synced per checkpoint, not per chunk."""
+        mock_file.return_value.__enter__.return_value.fileno.return_value = 3
+        callback = Mock()
+        strategy = StandardStrategy('/dev/sdb', 25 * MEGABYTE,
+                                    PROGRESS_SAVE_THRESHOLD // 10, 0,
+                                    progress_callback=callback)
+
+        with patch('builtins.print'):
+            strategy.wipe()
+
+        self.assertEqual(len(self.pwrite_calls), 3)
+        self.assertEqual(mock_fsync.call_args_list, [call(3)])
+        callback.assert_not_called()
+
+    @patch('wipe_strategy.PROGRESS_SYNC_INTERVAL', 0)
+    @patch('wipe_strategy.os.fsync')
+    def test_checkpoint_saved_after_sync(self, mock_fsync):
+        """Test progress is only saved once the device has been synced."""
+        events = []
+        mock_fsync.side_effect = lambda fd: events.append('sync')
+        strategy = StandardStrategy(
+            '/dev/sdb', 2 * PROGRESS_SAVE_THRESHOLD, PROGRESS_SAVE_THRESHOLD,
+            0, progress_callback=lambda *args: events.append('save'))
+
+        with patch('builtins.open', new_callable=mock_open), \
+                patch('builtins.print'), \
+                patch('chunk_producer.os.urandom', side_effect=bytes):
+            strategy.wipe()
+
+        # Nothing is left unsynced after the last checkpoint
+        self.assertEqual(events, ['sync', 'save', 'sync', 'save'])
+
+    @patch('wipe_strategy.time.monotonic', return_value=1000.0)
+    @patch('wipe_strategy.os.fsync')
+    def test_large_chunks_not_synced_per_chunk(self, mock_fsync, mock_time):
+        """Test chunks over the save threshold wait for the sync interval."""
+        callback = Mock()
+        strategy = StandardStrategy(
+            '/dev/sdb', 4 * PROGRESS_SAVE_THRESHOLD, PROGRESS_SAVE_THRESHOLD,
+            0, progress_callback=callback)
+
+        with patch('builtins.open', new_callable=mock_open), \
+                patch('builtins.print'), \
+                patch('chunk_producer.os.urandom', side_effect=bytes):
+            strategy.wipe()
+
+        mock_fsync.assert_called_once()  # Only the end of the pass
+        callback.assert_not_called()
+
+    @patch('wipe_strategy.os.fsync')
+    def test_sync_skipped_when_nothing_written(self, mock_fsync):
+        """Test no fsync is issued when already synced."""
+        strategy = StandardStrategy('/dev/sdb', 4 * MEGABYTE, MEGABYTE,
+                                    MEGABYTE)
+
+        strategy._sync_device(Mock())
+
+        mock_fsync.assert_not_called()
+        self.assertEqual(strategy.synced_position, MEGABYTE)
+
+    @patch('wipe_strategy.os.posix_fadvise')
+    @patch('wipe_strategy.os.fsync')
+    def test_buffered_sync_drops_synced_pages(self, mock_fsync,
+                                              mock_fadvise):
+        """Test buffered writes since the last sync are evicted."""
+        strategy = StandardStrategy('/dev/sdb', 4 * MEGABYTE, MEGABYTE,
+                                    MEGABYTE)
+        device = Mock()
+        device.fileno.return_value = 3
+
+        strategy._write_chunk(device, bytes(MEGABYTE))
+        mock_fadvise.assert_not_called()
+        strategy.written = 3 * MEGABYTE
+        strategy._sync_device(device)
+
+        self.assertEqual(mock_fadvise.call_args_list, [
+            call(3, MEGABYTE, 2 * MEGABYTE, os.POSIX_FADV_DONTNEED)])
+        self.assertEqual(strategy._synced_position, 3 * MEGABYTE)
+
+    @patch('wipe_strategy.os.posix_fadvise')
+    @patch('wipe_strategy.os.fsync')
+    def test_direct_sync_skips_fadvise(self, mock_fsync, mock_fadvise):
+        """Test O_DIRECT writes do not need eviction."""
+        strategy = StandardStrategy('/dev/sdb', 4 * MEGABYTE, MEGABYTE, 0)
+        strategy._direct_io = True
+        strategy.written = MEGABYTE
+
+        strategy._sync_device(Mock())
+
+        mock_fsync.assert_called_once()
+        mock_fadvise.assert_not_called()
+
+    @patch('wipe_strategy.os.posix_fadvise',
+           side_effect=OSError(errno.ESPIPE, 'ESPIPE'))
+    @patch('wipe_strategy.os.fsync')
+    def test_fadvise_failure_ignored(self, mock_fsync, mock_fadvise):
+        """Test unsupported fadvise does not fail the sync."""
+        strategy = StandardStrategy('/dev/sdb', 4 * MEGABYTE, MEGABYTE, 0)
+        strategy.written = 16
+
+        strategy._sync_device(Mock())
+
+        self.assertEqual(mock_fadvise.call_count, 1)
+
+
+class TestZeroOutStrategy(PwriteTestCase):
+    """Test ZeroOutStrategy class."""
+
+    def test_get_strategy_name(self):
+        """Test strategy name."""
+        strategy = ZeroOutStrategy('/dev/sdb', 1000, 100, 0)
+        self.assertEqual(strategy.get_strategy_name(), "zero_out")
+
+    @patch('builtins.print')
+    @patch('wipe_strategy.os.fsync')
+    @patch('wipe_strategy.fcntl.ioctl')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_zeroes_ranges_from_resume(self, mock_file, mock_ioctl,
+                                            mock_fsync, mock_print):
+        """Test BLKZEROOUT is issued per chunk from the resume position."""
+        mock_file_handle = mock_file.return_value.__enter__.return_value
+        mock_file_handle.fileno.return_value = 3
+        strategy = ZeroOutStrategy('/dev/sdb', 25 * MEGABYTE,
+                                   10 * MEGABYTE, 5 * MEGABYTE)
+
+        self.assertTrue(strategy.wipe())
+
+        self.assertEqual(strategy.written, 25 * MEGABYTE)
+        self.assertEqual(mock_ioctl.call_args_list, [
+            call(3, BLKZEROOUT, struct.pack('QQ', 5 * MEGABYTE,
+                                            10 * MEGABYTE)),
+            call(3, BLKZEROOUT, struct.pack('QQ', 15 * MEGABYTE,
+                                            10 * MEGABYTE)),
+        ])
+        self.assertEqual(self.pwrite_calls, [])
+
+    @patch('wipe_strategy.PROGRESS_SYNC_INTERVAL', 0)
+    @patch('builtins.print')
+    @patch('wipe_strategy.os.fsync')
+    @patch('wipe_strategy.fcntl.ioctl')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_saves_progress(self, mock_file, mock_ioctl, mock_fsync,
+                                 mock_print):
+        """Test progress is checkpointed while zeroing."""
+        callback = Mock()
+        strategy = ZeroOutStrategy('/dev/sdb', 2 * PROGRESS_SAVE_THRESHOLD,
+                                   PROGRESS_SAVE_THRESHOLD, 0,
+                                   progress_callback=callback)
+
+        strategy.wipe()
+
+        self.assertEqual(callback.call_count, 2)
+
+    @patch('builtins.print')
+    @patch('wipe_strategy.fcntl.ioctl',
+           side_effect=OSError(errno.EIO, 'I/O error'))
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_io_error_is_raised(self, mock_file, mock_ioctl,
+                                     mock_print):
+        """Test a real zeroing failure is not hidden by the fallback."""
+        strategy = ZeroOutStrategy('/dev/sdb', 10 * MEGABYTE,
+                                   10 * MEGABYTE, 0)
+
+        with self.assertRaises(OSError):
+            strategy.wipe()
+        self.assertIsNone(strategy._zeros)
+        self.assertEqual(self.pwrite_calls, [])
+
+
+class TestSecureDiscardStrategy(PwriteTestCase):
+    """Test SecureDiscardStrategy class."""
+
+    def test_get_strategy_name(self):
+        """Test strategy name."""
+        strategy = SecureDiscardStrategy('/dev/sdb', 1000, 100, 0)
+        self.assertEqual(strategy.get_strategy_name(), "secure_discard")
+
+    @patch('builtins.print')
+    @patch('wipe_strategy.os.fsync')
+    @patch('wipe_strategy.fcntl.ioctl')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_discards_ranges(self, mock_file, mock_ioctl, mock_fsync,
+                                  mock_print):
+        """Test BLKSECDISCARD is issued per chunk from the resume position."""
+        mock_file_handle = mock_file.return_value.__enter__.return_value
+        mock_file_handle.fileno.return_value = 3
+        strategy = SecureDiscardStrategy('/dev/sdb', 25 * MEGABYTE,
+                                         10 * MEGABYTE, 5 * MEGABYTE)
+
+        self.assertTrue(strategy.wipe())
+
+        self.assertEqual(strategy.written, 25 * MEGABYTE)
+        self.assertEqual(mock_ioctl.call_args_list, [
+            call(3, BLKSECDISCARD, struct.pack('QQ', 5 * MEGABYTE,
+                                               10 * MEGABYTE)),
+            call(3, BLKSECDISCARD, struct.pack('QQ', 15 * MEGABYTE,
+                                               10 * MEGABYTE)),
+        ])
+        self.assertEqual(self.pwrite_calls, [])
+
+    @patch('builtins.print')
+    @patch('wipe_strategy.os.fsync')
+    @patch('wipe_strategy.fcntl.ioctl')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_unsupported_discard_falls_back_to_zero_out(
+            self, mock_file, mock_ioctl, mock_fsync, mock_print):
+        """Test ranges are zeroed once the drive rejects secure discard."""
+        mock_file_handle = mock_file.return_value.__enter__.return_value
+        mock_file_handle.fileno.return_value = 3
+        mock_ioctl.side_effect = [OSError(errno.EOPNOTSUPP, 'EOPNOTSUPP'),
+                                  None, None]
+        strategy = SecureDiscardStrategy('/dev/sdb', 20 * MEGABYTE,
+                                         10 * MEGABYTE, 0)
+
+        self.assertTrue(strategy.wipe())
+
+        self.assertFalse(strategy._discard_supported)
+        self.assertEqual([c.args[1] for c in mock_ioctl.call_args_list],
+                         [BLKSECDISCARD, BLKZEROOUT, BLKZEROOUT])
+
+    @patch('builtins.print')
+    @patch('wipe_strategy.fcntl.ioctl',
+           side_effect=OSError(errno.EIO, 'I/O error'))
+    @patch('builtins.open', new_callable=mock_open)
+    def test_wipe_io_error_is_raised(self, mock_file, mock_ioctl,
+                                     mock_print):
+        """Test a real discard failure is not treated as unsupported."""
+        strategy = SecureDiscardStrategy('/dev/sdb', 10 * MEGABYTE,
+                                         10 * MEGABYTE, 0)
+
+        with self.assertRaises(OSError):
+            strategy.wipe()
+        self.assertTrue(strategy._discard_supported)
+
+
+class TestStrategyIntegration(PwriteTestCase):
     """Integration tests for strategy selection and usage."""
 
     def test_all_strategies_implement_interface(self):
@@ -682,9 +1120,10 @@ class TestStrategyIntegration(unittest.TestCase):
 
         self.assertEqual(len(names), len(set(names)))
 
+    @patch('wipe_strategy.PROGRESS_SYNC_INTERVAL', 0)
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_strategies_work_with_callbacks(self, mock_time, mock_fsync,
                                             mock_file):
         """Test all strategies work with progress callbacks."""
@@ -713,7 +1152,7 @@ class TestStrategyIntegration(unittest.TestCase):
 
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_strategies_handle_resume(self, mock_time, mock_fsync,
                                       mock_file):
         """Test all strategies handle resume correctly."""
@@ -742,7 +1181,7 @@ class TestStrategyIntegration(unittest.TestCase):
 
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
@@ -791,7 +1230,7 @@ class TestStrategyIntegration(unittest.TestCase):
                     f"milestone at 10%")
 
     @patch('time.strftime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     def test_milestone_uniqueness_all_strategies(
             self, mock_print, mock_time, mock_strftime):
@@ -833,7 +1272,7 @@ class TestStrategyIntegration(unittest.TestCase):
 
     @patch('time.strftime')
     @patch('time.localtime')
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('builtins.print')
     @patch('builtins.open', new_callable=mock_open)
     @patch('os.fsync')
@@ -889,22 +1328,4 @@ class TestStrategyIntegration(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    test_suite = unittest.TestSuite()
-
-    test_classes = [
-        TestWipeStrategyBase,
-        TestStandardStrategy,
-        TestSmallChunkStrategy,
-        TestAdaptiveStrategy,
-        TestStrategyIntegration,
-    ]
-
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        test_suite.addTests(tests)
-
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
-
-    import sys
-    sys.exit(0 if result.wasSuccessful() else 1)
+    unittest.main()
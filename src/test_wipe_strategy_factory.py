@@ -4,7 +4,8 @@
 import unittest
 from wipe_strategy_factory import WipeStrategyFactory
 from wipe_strategy import (StandardStrategy, AdaptiveStrategy,
-                           SmallChunkStrategy, OverrideStrategy)
+                           SmallChunkStrategy, OverrideStrategy,
+                           ZeroOutStrategy, SecureDiscardStrategy)
 
 
 class TestWipeStrategyFactory(unittest.TestCase):
@@ -34,6 +35,18 @@ class TestWipeStrategyFactory(unittest.TestCase):
             'buffer_override', '/dev/sdb', 1000000, 1024)
         self.assertIsInstance(strategy, OverrideStrategy)
 
+    def test_factory_creates_zero_out_strategy(self):
+        """Test factory creates ZeroOutStrategy."""
+        strategy = WipeStrategyFactory.create_strategy(
+            'zero_out', '/dev/sdb', 1000000, 1024)
+        self.assertIsInstance(strategy, ZeroOutStrategy)
+
+    def test_factory_creates_secure_discard_strategy(self):
+        """Test factory creates SecureDiscardStrategy."""
+        strategy = WipeStrategyFactory.create_strategy(
+            'secure_discard', '/dev/sdb', 1000000, 1024)
+        self.assertIsInstance(strategy, SecureDiscardStrategy)
+
     def test_factory_raises_on_unknown_algorithm(self):
         """Test factory raises ValueError on unknown algorithm."""
         with self.assertRaises(ValueError) as ctx:
@@ -49,7 +62,9 @@ class TestWipeStrategyFactory(unittest.TestCase):
         self.assertIn('adaptive_chunk', algos)
         self.assertIn('small_chunk', algos)
         self.assertIn('buffer_override', algos)
-        self.assertEqual(len(algos), 4)
+        self.assertIn('zero_out', algos)
+        self.assertIn('secure_discard', algos)
+        self.assertEqual(len(algos), 6)
 
     def test_factory_register_new_strategy(self):
         """Test factory can register new strategies."""
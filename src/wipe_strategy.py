@@ -4,20 +4,36 @@ WipeStrategy classes for wipeit - Secure device wiping utility.
 
 This module provides the Strategy pattern for different wiping algorithms:
 - StandardStrategy: Fixed chunk size wiping
-- AdaptiveStrategy: Dynamic chunk sizing based on position and speed
+- AdaptiveStrategy: Dynamic chunk sizing based on measured speed
 - SmallChunkStrategy: Small chunks for slow/unreliable drives
+- ZeroOutStrategy: Kernel-side zeroing with the BLKZEROOUT ioctl
+- SecureDiscardStrategy: Secure discard with the BLKSECDISCARD ioctl
 """
 
+import errno
+import fcntl
+import mmap
 import os
+import struct
 import time
 from abc import ABC, abstractmethod
 
+from chunk_producer import ChunkProducer
 from global_constants import (
+    ADAPTIVE_MAX_CHUNK_SIZE,
+    ADAPTIVE_MIN_CHUNK_SIZE,
+    ADAPTIVE_SPEED_SMOOTHING,
+    ADAPTIVE_TARGET_CHUNK_SECONDS,
+    BLKSECDISCARD,
+    BLKZEROOUT,
+    DIRECT_IO_ALIGNMENT,
     GIGABYTE,
     MAX_SMALL_CHUNK_SIZE,
     MEGABYTE,
     MILESTONE_INCREMENT_PERCENT,
+    PROGRESS_DISPLAY_INTERVAL,
     PROGRESS_SAVE_THRESHOLD,
+    PROGRESS_SYNC_INTERVAL,
 )
 
 
@@ -47,10 +63,14 @@ class WipeStrategy(ABC):
         self.total_size = total_size
         self.chunk_size = chunk_size
         self.written = start_position
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.pretest_results = pretest_results
         self.progress_callback = progress_callback
         self.written_since_last_save = 0  # Track bytes since last checkpoint
+        self._direct_io = False  # Set by _direct_opener when O_DIRECT sticks
+        self._last_display = None  # time.monotonic() of last progress line
+        self._synced_position = start_position  # Written and flushed
+        self._last_sync = self.start_time  # time.monotonic() of last sync
         # Calculate last milestone based on start position for resume support
         if total_size > 0:
             current_percent = (start_position / total_size) * 100
@@ -90,7 +110,7 @@ class WipeStrategy(ABC):
         Returns:
             str: Formatted ETA string (HH:MM:SS) or "??:??:??"
         """
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
         if self.written > 0 and elapsed_time > 0:
             eta_seconds = (self.total_size - self.written) / \
                          (self.written / elapsed_time)
@@ -117,11 +137,32 @@ class WipeStrategy(ABC):
         """
         Display progress information.
 
+        Called after every chunk, but the progress line is only redrawn
+        once per PROGRESS_DISPLAY_INTERVAL, at 5% milestones and on the
+        final chunk, so formatting and terminal writes stay off the hot
+        path on large devices.
+
         Args:
             current_speed: Optional current speed in MB/s
             current_chunk: Optional current chunk size in bytes (for adaptive)
         """
+        # Integer form of "percent done reached the next milestone", so
+        # the common no-redraw call does no float math
+        next_milestone = self.last_milestone + MILESTONE_INCREMENT_PERCENT
+        milestone_reached = (self.written * 100 >=
+                             next_milestone * self.total_size and
+                             self.written > 0)
+
+        now = time.monotonic()
+        if not (milestone_reached or self.written >= self.total_size or
+                self._last_display is None or
+                now - self._last_display >= PROGRESS_DISPLAY_INTERVAL):
+            return
+        self._last_display = now
+
         progress_percent = (self.written / self.total_size) * 100
+        current_milestone = self.written * 100 // self.total_size // \
+            MILESTONE_INCREMENT_PERCENT * MILESTONE_INCREMENT_PERCENT
         eta_str = self._calculate_eta()
         bar = self._format_progress_bar()
 
@@ -142,14 +183,10 @@ class WipeStrategy(ABC):
               f"{speed_str}{buffer_str}", end='', flush=True)
 
         # Display estimated finish time at 5% milestones
-        current_milestone = int(progress_percent) // \
-            MILESTONE_INCREMENT_PERCENT * MILESTONE_INCREMENT_PERCENT
-        if (current_milestone > self.last_milestone and
-                current_milestone % MILESTONE_INCREMENT_PERCENT == 0 and
-                self.written > 0):
+        if milestone_reached:
             self.last_milestone = current_milestone
             # Calculate estimated finish time
-            elapsed_time = time.time() - self.start_time
+            elapsed_time = time.monotonic() - self.start_time
             if elapsed_time > 0:
                 eta_seconds = (self.total_size - self.written) / \
                              (self.written / elapsed_time)
@@ -164,18 +201,123 @@ class WipeStrategy(ABC):
         Trigger progress checkpoint save via callback.
 
         Calls the progress_callback if provided, allowing external code
-        to handle progress file operations.
+        to handle progress file operations. The byte counter is reset
+        either way, so checkpoints follow bytes written rather than
+        whether written happens to be a multiple of the chunk size.
         """
         if self.progress_callback:
             self.progress_callback(self.written, self.total_size,
                                    self.chunk_size)
-            self.written_since_last_save = 0  # Reset counter after save
+        self.written_since_last_save = 0  # Reset counter after save
+
+    def _chunk_producer(self, max_chunk_size):
+        """
+        Create a ChunkProducer with buffers for the rest of the pass.
+
+        Args:
+            max_chunk_size: Largest chunk the strategy asks for
+
+        Returns:
+            ChunkProducer: Producer whose buffers fit every chunk
+        """
+        remaining = self.total_size - self.written
+        # No chunk is larger than what is left; an mmap cannot be empty
+        return ChunkProducer(max(1, min(max_chunk_size, remaining)))
+
+    def _open_device(self):
+        """
+        Open the device for writing.
 
-    def _write_chunk(self, chunk_data):
+        The data is random and never read back, so O_DIRECT is requested
+        to keep it out of the page cache. The device is opened unbuffered;
+        chunks are written with os.pwrite() at explicit offsets, so the
+        file position is never used.
+
+        Returns:
+            file: Unbuffered binary file object for the device
         """
-        Write a chunk of data to the device.
+        self._direct_io = False
+        opener = None
+        if self.written % DIRECT_IO_ALIGNMENT == 0:
+            opener = self._direct_opener
+        return open(self.device_path, 'wb', buffering=0, opener=opener)
+
+    def _direct_opener(self, path, flags):
+        """
+        Open path with O_DIRECT, falling back to buffered I/O.
 
         Args:
+            path: Device path
+            flags: Flags chosen by open()
+
+        Returns:
+            int: File descriptor
+        """
+        try:
+            fd = os.open(path, flags | os.O_DIRECT)
+        except OSError:
+            # Filesystem or driver does not support O_DIRECT (e.g. tmpfs)
+            return os.open(path, flags)
+        self._direct_io = True
+        return fd
+
+    def _disable_direct_io(self, device):
+        """Clear O_DIRECT so an unaligned tail can be written buffered."""
+        flags = fcntl.fcntl(device.fileno(), fcntl.F_GETFL)
+        fcntl.fcntl(device.fileno(), fcntl.F_SETFL, flags & ~os.O_DIRECT)
+        self._direct_io = False
+
+    def _pwrite_all(self, device, data, offset):
+        """
+        Write all of data at offset, retrying short writes.
+
+        Args:
+            device: Device file object
+            data: Bytes-like object to write
+            offset: Device offset in bytes
+        """
+        view = memoryview(data)
+        while view:
+            count = os.pwrite(device.fileno(), view, offset)
+            view = view[count:]
+            offset += count
+
+    def _write_direct(self, device, chunk_data):
+        """
+        Write chunk_data in place with O_DIRECT.
+
+        O_DIRECT needs the buffer, length and offset aligned to the
+        logical block size. Every caller passes a view starting at the
+        beginning of an anonymous mmap (ChunkProducer's chunk buffers,
+        ZeroOutStrategy's zero buffer), which is page-aligned. Any
+        unaligned tail is written after switching the descriptor back to
+        buffered I/O.
+
+        Args:
+            device: Device file object opened with O_DIRECT
+            chunk_data: memoryview of a page-aligned anonymous mmap
+        """
+        chunk_data = memoryview(chunk_data)
+        assert isinstance(chunk_data.obj, mmap.mmap), \
+            "O_DIRECT writes need a page-aligned mmap buffer"
+        aligned = len(chunk_data) - len(chunk_data) % DIRECT_IO_ALIGNMENT
+        if aligned:
+            self._pwrite_all(device, chunk_data[:aligned], self.written)
+        if aligned < len(chunk_data):
+            self._disable_direct_io(device)
+            self._pwrite_all(device, chunk_data[aligned:],
+                             self.written + aligned)
+
+    def _write_chunk(self, device, chunk_data):
+        """
+        Write a chunk of data at offset self.written.
+
+        The device is opened once per wipe and each chunk is a single
+        pwrite, with no open, seek, close or sync per chunk; the device is
+        synced by _sync_device() at checkpoints instead.
+
+        Args:
+            device: Device file object opened by _open_device()
             chunk_data: Bytes to write
 
         Returns:
@@ -184,13 +326,84 @@ class WipeStrategy(ABC):
         Raises:
             IOError: If write fails
         """
-        chunk_start_time = time.time()
-        with open(self.device_path, 'wb') as f:
-            f.seek(self.written)
-            f.write(chunk_data)
-            f.flush()
-            os.fsync(f.fileno())
-        return time.time() - chunk_start_time
+        chunk_start_time = time.monotonic()
+        if self._direct_io:
+            self._write_direct(device, chunk_data)
+        else:
+            self._pwrite_all(device, chunk_data, self.written)
+        return time.monotonic() - chunk_start_time
+
+    @property
+    def synced_position(self):
+        """
+        Position up to which data is known to be on the device.
+
+        Unlike written, this never runs ahead of the last fsync, so it is
+        the position to save when a wipe stops part way.
+
+        Returns:
+            int: Bytes written and synced
+        """
+        return self._synced_position
+
+    def _checkpoint(self, device):
+        """
+        Sync the device and save progress when a checkpoint is due.
+
+        A checkpoint needs PROGRESS_SAVE_THRESHOLD bytes written and
+        PROGRESS_SYNC_INTERVAL seconds since the last sync, so large
+        chunks do not turn into an fsync per chunk.
+
+        Args:
+            device: Device file object opened by _open_device()
+        """
+        if self.written_since_last_save < PROGRESS_SAVE_THRESHOLD:
+            return
+        if time.monotonic() - self._last_sync < PROGRESS_SYNC_INTERVAL:
+            return
+        self._sync_device(device)
+        self._save_progress_checkpoint()
+
+    def _sync_device(self, device):
+        """
+        Flush everything written since the last sync to the device.
+
+        Called before each progress checkpoint and at the end of the pass,
+        so a saved position never runs ahead of data on the device while
+        chunks in between stream without a sync round trip each. Does
+        nothing if no data was written since the last sync.
+
+        Args:
+            device: Device file object opened by _open_device()
+        """
+        if self._synced_position == self.written:
+            return
+        os.fsync(device.fileno())
+        if not self._direct_io:
+            self._drop_cached_pages(device, self._synced_position,
+                                    self.written - self._synced_position)
+        self._synced_position = self.written
+        self._last_sync = time.monotonic()
+
+    def _drop_cached_pages(self, device, offset, length):
+        """
+        Evict just-synced buffered writes from the page cache.
+
+        Buffered writes leave wipe data cached even though it is never
+        read back, pushing out other processes' pages. The pages are
+        clean after fsync, so POSIX_FADV_DONTNEED can drop them at once.
+        Advice only, so failures are ignored.
+
+        Args:
+            device: Device file object
+            offset: Start of the synced range in bytes
+            length: Length of the synced range in bytes
+        """
+        try:
+            os.posix_fadvise(device.fileno(), offset, length,
+                             os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
 
 
 class StandardStrategy(WipeStrategy):
@@ -221,20 +434,31 @@ class StandardStrategy(WipeStrategy):
             KeyboardInterrupt: If user interrupts the wipe
             Exception: On I/O or other errors
         """
-        while self.written < self.total_size:
-            current_chunk_size = min(self.chunk_size,
-                                     self.total_size - self.written)
+        with self._open_device() as device, \
+                self._chunk_producer(self.chunk_size) as producer:
+            if self.written < self.total_size:
+                producer.request(min(self.chunk_size,
+                                     self.total_size - self.written))
+            while self.written < self.total_size:
+                chunk_data = producer.take()
+                current_chunk_size = len(chunk_data)
 
-            chunk_data = os.urandom(current_chunk_size)
-            self._write_chunk(chunk_data)
+                # Generate the next chunk while this one is written
+                next_position = self.written + current_chunk_size
+                if next_position < self.total_size:
+                    producer.request(min(self.chunk_size,
+                                         self.total_size - next_position))
 
-            self.written += current_chunk_size
-            self.written_since_last_save += current_chunk_size
+                self._write_chunk(device, chunk_data)
 
-            self._display_progress()
+                self.written += current_chunk_size
+                self.written_since_last_save += current_chunk_size
 
-            if self.written_since_last_save >= PROGRESS_SAVE_THRESHOLD:
-                self._save_progress_checkpoint()
+                self._display_progress()
+
+                self._checkpoint(device)
+
+            self._sync_device(device)
 
         print()
         return True
@@ -282,8 +506,8 @@ class OverrideStrategy(StandardStrategy):
 
     Used when user explicitly specifies buffer size with
     -b/--force-buffer-size. Bypasses algorithm selection and uses
-    standard sequential wiping with the exact buffer size requested
-    by the user.
+    standard sequential wiping with the buffer size requested by the
+    user, rounded up to the device's I/O size as for every strategy.
     """
 
     def get_strategy_name(self):
@@ -300,12 +524,12 @@ class AdaptiveStrategy(WipeStrategy):
     """
     Adaptive wiping strategy with dynamic chunk sizing.
 
-    Adjusts chunk size based on disk position and write speed:
-    - Beginning (0-10%): Larger chunks (faster outer tracks)
-    - Middle (10-90%): Adaptive based on speed
-    - End (90-100%): Smaller chunks (slower inner tracks)
-
-    Tracks speed samples to optimize performance on HDDs.
+    Sizes each chunk from the measured write speed so it takes about
+    ADAPTIVE_TARGET_CHUNK_SECONDS: larger on fast outer tracks, smaller on
+    slow inner tracks or a struggling drive. The speed is an exponentially
+    weighted moving average of recent chunks, so one slow write does not
+    swing the size. The first chunk uses the base chunk size; all sizes
+    stay within ADAPTIVE_MIN_CHUNK_SIZE..ADAPTIVE_MAX_CHUNK_SIZE.
     """
 
     def __init__(self, device_path, total_size, chunk_size,
@@ -324,7 +548,7 @@ class AdaptiveStrategy(WipeStrategy):
         """
         super().__init__(device_path, total_size, chunk_size,
                          start_position, pretest_results, progress_callback)
-        self._speed_samples = []
+        self._speed_estimate = None  # Smoothed write speed in MB/s
 
     def get_strategy_name(self):
         """
@@ -335,37 +559,44 @@ class AdaptiveStrategy(WipeStrategy):
         """
         return "adaptive_chunk"
 
-    def _calculate_adaptive_chunk_size(self):
+    def _calculate_adaptive_chunk_size(self, position=None):
         """
-        Calculate adaptive chunk size based on position and speed.
+        Calculate the next chunk size from the measured write speed.
+
+        Args:
+            position: Offset the chunk starts at (default: self.written)
 
         Returns:
             int: Calculated chunk size in bytes (guaranteed integer)
         """
-        position_ratio = self.written / self.total_size
+        if position is None:
+            position = self.written
 
-        if position_ratio < 0.1:
-            current_chunk_size = int(self.chunk_size * 2)
-        elif position_ratio > 0.9:
-            current_chunk_size = int(self.chunk_size * 0.5)
+        if self._speed_estimate is None:
+            current_chunk_size = self.chunk_size
         else:
-            if len(self._speed_samples) > 0:
-                recent_samples = self._speed_samples[-5:]
-                avg_speed = sum(recent_samples) / len(recent_samples)
-                if avg_speed < 50:
-                    current_chunk_size = int(self.chunk_size * 0.5)
-                elif avg_speed > 200:
-                    current_chunk_size = int(self.chunk_size * 1.5)
-                else:
-                    current_chunk_size = self.chunk_size
-            else:
-                current_chunk_size = self.chunk_size
-
-        current_chunk_size = max(MEGABYTE,
+            current_chunk_size = int(self._speed_estimate * MEGABYTE *
+                                     ADAPTIVE_TARGET_CHUNK_SECONDS)
+        current_chunk_size = max(ADAPTIVE_MIN_CHUNK_SIZE,
                                  min(current_chunk_size,
-                                     self.total_size - self.written))
+                                     ADAPTIVE_MAX_CHUNK_SIZE))
 
-        return int(current_chunk_size)
+        # Scaled sizes stay block-aligned so O_DIRECT is not dropped
+        current_chunk_size -= current_chunk_size % DIRECT_IO_ALIGNMENT
+        return int(min(current_chunk_size, self.total_size - position))
+
+    def _record_speed(self, chunk_speed):
+        """
+        Fold a chunk's write speed into the smoothed estimate.
+
+        Args:
+            chunk_speed: Write speed of the last chunk in MB/s
+        """
+        if self._speed_estimate is None:
+            self._speed_estimate = chunk_speed
+        else:
+            self._speed_estimate += ADAPTIVE_SPEED_SMOOTHING * (
+                chunk_speed - self._speed_estimate)
 
     def wipe(self):
         """
@@ -378,26 +609,214 @@ class AdaptiveStrategy(WipeStrategy):
             KeyboardInterrupt: If user interrupts the wipe
             Exception: On I/O or other errors
         """
-        while self.written < self.total_size:
-            current_chunk_size = self._calculate_adaptive_chunk_size()
+        with self._open_device() as device, \
+                self._chunk_producer(ADAPTIVE_MAX_CHUNK_SIZE) as producer:
+            if self.written < self.total_size:
+                producer.request(self._calculate_adaptive_chunk_size())
+            while self.written < self.total_size:
+                chunk_data = producer.take()
+                current_chunk_size = len(chunk_data)
+
+                # Size the next chunk from the speeds seen so far and
+                # generate it while this one is written
+                next_position = self.written + current_chunk_size
+                if next_position < self.total_size:
+                    producer.request(
+                        self._calculate_adaptive_chunk_size(next_position))
+
+                chunk_duration = self._write_chunk(device, chunk_data)
+
+                if chunk_duration > 0:
+                    chunk_speed = (current_chunk_size / chunk_duration /
+                                   MEGABYTE)
+                    self._record_speed(chunk_speed)
+                else:
+                    chunk_speed = 0
+
+                self.written += current_chunk_size
+                self.written_since_last_save += current_chunk_size
+
+                self._display_progress(current_speed=chunk_speed,
+                                       current_chunk=current_chunk_size)
+
+                self._checkpoint(device)
+
+            self._sync_device(device)
+
+        print()
+        return True
+
+
+class ZeroOutStrategy(WipeStrategy):
+    """
+    Zero-out strategy - lets the kernel and drive zero the device.
+
+    Issues BLKZEROOUT for each chunk-sized range instead of writing
+    random data from user space. Drives that support WRITE ZEROES do the
+    work internally; otherwise the kernel writes zero pages itself. No
+    wipe data crosses from user space, so this is much faster on SSDs
+    and NVMe. Progress is still reported and saved per range.
+
+    Where BLKZEROOUT is unsupported (not a block device, or a driver
+    without it), zeros are written from one preallocated zero-filled
+    buffer, so the pass still costs no random data generation.
+    """
+
+    def __init__(self, device_path, total_size, chunk_size,
+                 start_position=0, pretest_results=None,
+                 progress_callback=None):
+        """
+        Initialize zero-out strategy.
+
+        Args:
+            device_path: Path to block device
+            total_size: Total size of device in bytes
+            chunk_size: Size of each zeroed range in bytes
+            start_position: Starting position in bytes (for resume)
+            pretest_results: Optional pretest results dict
+            progress_callback: Optional progress callback function
+        """
+        super().__init__(device_path, total_size, chunk_size,
+                         start_position, pretest_results, progress_callback)
+        self._zeros = None  # Zero buffer, set once BLKZEROOUT fails
+
+    def get_strategy_name(self):
+        """
+        Get the name of this strategy.
+
+        Returns:
+            str: "zero_out"
+        """
+        return "zero_out"
+
+    def _zero_range(self, device, length):
+        """
+        Zero length bytes starting at the current position.
+
+        Args:
+            device: Device file object
+            length: Number of bytes to zero
+
+        Returns:
+            float: Time taken in seconds
+
+        Raises:
+            OSError: If zeroing the range fails
+        """
+        if self._zeros is None:
+            range_start_time = time.monotonic()
+            try:
+                fcntl.ioctl(device.fileno(), BLKZEROOUT,
+                            struct.pack('QQ', self.written, length))
+                return time.monotonic() - range_start_time
+            except OSError as e:
+                # ENOTTY: not a block device; others: no zeroing support
+                if e.errno not in (errno.ENOTTY, errno.EOPNOTSUPP,
+                                   errno.EINVAL):
+                    raise
+                # Anonymous mmaps are zero-filled and page-aligned
+                self._zeros = mmap.mmap(-1, self.chunk_size)
+        with memoryview(self._zeros) as view, view[:length] as zeros:
+            return self._write_chunk(device, zeros)
+
+    def wipe(self):
+        """
+        Execute zero-out wiping one chunk-sized range at a time.
+
+        Returns:
+            bool: True if wipe completed successfully
+
+        Raises:
+            KeyboardInterrupt: If user interrupts the wipe
+            Exception: On I/O or other errors
+        """
+        with self._open_device() as device:
+            while self.written < self.total_size:
+                current_chunk_size = min(self.chunk_size,
+                                         self.total_size - self.written)
 
-            chunk_data = os.urandom(current_chunk_size)
-            chunk_duration = self._write_chunk(chunk_data)
+                self._zero_range(device, current_chunk_size)
 
-            if chunk_duration > 0:
-                chunk_speed = current_chunk_size / chunk_duration / MEGABYTE
-                self._speed_samples.append(chunk_speed)
-            else:
-                chunk_speed = 0
+                self.written += current_chunk_size
+                self.written_since_last_save += current_chunk_size
 
-            self.written += current_chunk_size
-            self.written_since_last_save += current_chunk_size
+                self._display_progress()
 
-            self._display_progress(current_speed=chunk_speed,
-                                   current_chunk=current_chunk_size)
+                self._checkpoint(device)
 
-            if self.written_since_last_save >= PROGRESS_SAVE_THRESHOLD:
-                self._save_progress_checkpoint()
+            self._sync_device(device)
 
         print()
         return True
+
+
+class SecureDiscardStrategy(ZeroOutStrategy):
+    """
+    Secure discard strategy - has flash storage erase the mappings.
+
+    Issues BLKSECDISCARD for each chunk-sized range. The drive drops the
+    mapped blocks and erases them, including copies that wear leveling
+    has moved out of reach of an overwrite, and finishes in a fraction of
+    the time of writing the whole device.
+
+    Most drives do not support secure discard. Then the remaining ranges
+    are zeroed as in ZeroOutStrategy. Plain BLKDISCARD is not used as a
+    fallback, since reads of discarded blocks are not guaranteed to
+    return zeros.
+    """
+
+    def __init__(self, device_path, total_size, chunk_size,
+                 start_position=0, pretest_results=None,
+                 progress_callback=None):
+        """
+        Initialize secure discard strategy.
+
+        Args:
+            device_path: Path to block device
+            total_size: Total size of device in bytes
+            chunk_size: Size of each discarded range in bytes
+            start_position: Starting position in bytes (for resume)
+            pretest_results: Optional pretest results dict
+            progress_callback: Optional progress callback function
+        """
+        super().__init__(device_path, total_size, chunk_size,
+                         start_position, pretest_results, progress_callback)
+        self._discard_supported = True  # Cleared once BLKSECDISCARD fails
+
+    def get_strategy_name(self):
+        """
+        Get the name of this strategy.
+
+        Returns:
+            str: "secure_discard"
+        """
+        return "secure_discard"
+
+    def _zero_range(self, device, length):
+        """
+        Securely discard length bytes starting at the current position.
+
+        Falls back to zeroing the range if secure discard is unsupported.
+
+        Args:
+            device: Device file object
+            length: Number of bytes to discard
+
+        Returns:
+            float: Time taken in seconds
+
+        Raises:
+            OSError: If discarding or zeroing the range fails
+        """
+        if self._discard_supported:
+            range_start_time = time.monotonic()
+            try:
+                fcntl.ioctl(device.fileno(), BLKSECDISCARD,
+                            struct.pack('QQ', self.written, length))
+                return time.monotonic() - range_start_time
+            except OSError as e:
+                if e.errno not in (errno.ENOTTY, errno.EOPNOTSUPP,
+                                   errno.EINVAL):
+                    raise
+                self._discard_supported = False
+        return super()._zero_range(device, length)
@@ -6,7 +6,8 @@ Implements the Factory pattern to encapsulate strategy creation logic.
 """
 
 from wipe_strategy import (StandardStrategy, AdaptiveStrategy,
-                           SmallChunkStrategy, OverrideStrategy)
+                           SmallChunkStrategy, OverrideStrategy,
+                           ZeroOutStrategy, SecureDiscardStrategy)
 
 
 class WipeStrategyFactory:
@@ -22,7 +23,9 @@ class WipeStrategyFactory:
         'standard': StandardStrategy,
         'adaptive_chunk': AdaptiveStrategy,
         'small_chunk': SmallChunkStrategy,
-        'buffer_override': OverrideStrategy
+        'buffer_override': OverrideStrategy,
+        'zero_out': ZeroOutStrategy,
+        'secure_discard': SecureDiscardStrategy
     }
 
     @classmethod
@@ -7,6 +7,8 @@ Overwrites block devices with random data for secure data destruction.
 import argparse
 import json
 import os
+import re
+import signal
 import subprocess
 import sys
 import time
@@ -14,16 +16,22 @@ import time
 from device_detector import DeviceDetector
 from disk_pretest import DiskPretest
 from global_constants import (
+    CHUNK_ALIGNMENT,
     DEFAULT_CHUNK_SIZE,
+    DIRECT_IO_ALIGNMENT,
     DISPLAY_LINE_WIDTH,
+    FLASH_DISK_TYPES,
     GIGABYTE,
     MAX_SIZE_BYTES,
     MAX_SMALL_CHUNK_SIZE,
     MEGABYTE,
     MIN_SIZE_BYTES,
     PROGRESS_FILE_NAME,
+    PROGRESS_TEMP_FILE_NAME,
     TERABYTE,
 )
+from progress_file_version import ProgressFileVersion
+from progress_writer import ProgressWriter
 from wipe_strategy import (
     AdaptiveStrategy,
     SmallChunkStrategy,
@@ -31,13 +39,30 @@ from wipe_strategy import (
 )
 
 
+def get_disk_devices():
+    """
+    List whole-disk block devices reported by lsblk.
+
+    Returns:
+        list: Device paths like '/dev/sdb', in lsblk order
+
+    Raises:
+        OSError, subprocess.CalledProcessError: If lsblk cannot be run
+    """
+    output = subprocess.check_output(['lsblk', '-dno', 'NAME,TYPE'])
+    disks = []
+    for line in output.decode().splitlines():
+        fields = line.split()
+        if len(fields) > 1 and fields[1] == 'disk':
+            disks.append('/dev/' + fields[0])
+    return disks
+
+
 def list_all_devices():
     try:
-        output = subprocess.check_output(['lsblk', '-dno', 'NAME,TYPE'])\
-            .decode().splitlines()
-        disks = ['/dev/' + line.split()[0]
-                 for line in output
-                 if len(line.split()) > 1 and line.split()[1] == 'disk']
+        disks = get_disk_devices()
+        # Device details are quick sysfs and /proc reads, so devices are
+        # queried one after another
         for device in disks:
             detector = DeviceDetector(device)
             detector.display_info()
@@ -46,26 +71,26 @@ def list_all_devices():
         print(f"Error listing devices: {e}")
 
 
+# Number with optional decimals followed by an M, G or T suffix
+_SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d*)?|\.\d+)\s*([MGT])\s*$',
+                           re.IGNORECASE)
+_SIZE_MULTIPLIERS = {
+    'M': MEGABYTE,
+    'G': GIGABYTE,
+    'T': TERABYTE
+}
+
+
 def parse_size(size_str) -> int:
     """Parse size string with M, G, T suffix (e.g., '100M', '1G', '500M')."""
-    size_str = size_str.upper().strip()
-
-    if size_str[-1] in ['M', 'G', 'T']:
-        try:
-            value = float(size_str[:-1])
-            suffix = size_str[-1]
-        except ValueError:
+    match = _SIZE_PATTERN.match(size_str)
+    if not match:
+        if size_str.strip()[-1:].upper() in _SIZE_MULTIPLIERS:
             raise ValueError(f"Invalid size format: {size_str}")
-    else:
         raise ValueError(f"Size must end with M, G, or T: {size_str}")
 
-    multipliers = {
-        'M': MEGABYTE,
-        'G': GIGABYTE,
-        'T': TERABYTE
-    }
-
-    size_bytes = int(value * multipliers[suffix])
+    value, suffix = match.groups()
+    size_bytes = int(float(value) * _SIZE_MULTIPLIERS[suffix.upper()])
 
     if size_bytes < MIN_SIZE_BYTES:
         raise ValueError("Buffer size must be at least 1M")
@@ -90,8 +115,6 @@ def save_progress(device, written, total_size,
         device_id: Optional device unique identifiers (serial, model, etc.)
         algorithm: Optional algorithm name for resume consistency
     """
-    from progress_file_version import ProgressFileVersion
-
     progress_file = PROGRESS_FILE_NAME
     progress_percent = (written / total_size) * 100 if total_size > 0 else 0
     progress_data = {
@@ -109,11 +132,18 @@ def save_progress(device, written, total_size,
     # Add version number using ProgressFileVersion
     progress_data = ProgressFileVersion.add_version_to_data(progress_data)
 
+    # Write a temp file and rename it over the old one, so a crash
+    # mid-write leaves the previous checkpoint intact
     try:
-        with open(progress_file, 'w') as f:
-            json.dump(progress_data, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+        data = json.dumps(progress_data, separators=(',', ':')).encode()
+        fd = os.open(PROGRESS_TEMP_FILE_NAME,
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(PROGRESS_TEMP_FILE_NAME, progress_file)
     except Exception as e:
         print(f"Warning: Could not save progress: {e}")
 
@@ -128,8 +158,6 @@ def load_progress(device):
     Returns:
         dict: Progress data if valid, None otherwise
     """
-    from progress_file_version import ProgressFileVersion
-
     progress_file = PROGRESS_FILE_NAME
 
     if not os.path.exists(progress_file):
@@ -272,11 +300,7 @@ def find_device_by_serial_model():
 
     # Get all block devices
     try:
-        output = subprocess.check_output(['lsblk', '-dno', 'NAME,TYPE'])\
-            .decode().splitlines()
-        disks = ['/dev/' + line.split()[0]
-                 for line in output
-                 if len(line.split()) > 1 and line.split()[1] == 'disk']
+        disks = get_disk_devices()
     except Exception as e:
         print(f"Error listing devices: {e}")
         return None, None
@@ -314,24 +338,19 @@ def find_resume_file():
     Returns:
         dict or None: Progress data if file exists and is valid, None otherwise
     """
-    from progress_file_version import ProgressFileVersion
-
-    progress_file = PROGRESS_FILE_NAME
-
-    if os.path.exists(progress_file):
-        try:
-            with open(progress_file, 'r') as f:
-                progress_data = json.load(f)
-
-            # Migrate progress data if needed (silently for find)
-            progress_data, _, _ = \
-                ProgressFileVersion.migrate_progress_data(progress_data)
+    # Open directly; a missing file is the common case and costs one
+    # failed open() rather than a stat() followed by an open()
+    try:
+        with open(PROGRESS_FILE_NAME, 'r') as f:
+            progress_data = json.load(f)
 
-            return progress_data
-        except Exception:
-            pass
+        # Migrate progress data if needed (silently for find)
+        progress_data, _, _ = \
+            ProgressFileVersion.migrate_progress_data(progress_data)
 
-    return None
+        return progress_data
+    except Exception:
+        return None
 
 
 def display_resume_info():
@@ -392,6 +411,34 @@ def calculate_average_speed(total_bytes, elapsed_seconds):
         return 0.0
 
 
+def align_chunk_size(chunk_size, optimal_io_size):
+    """
+    Round chunk size up to a multiple of the device's optimal I/O size.
+
+    Whole multiples split into full-size requests in the block layer and
+    keep every chunk a multiple of the O_DIRECT alignment. An
+    optimal_io_size that is not a multiple of DIRECT_IO_ALIGNMENT (some
+    USB bridges report 33553920) is ignored, since rounding to it would
+    leave chunks unaligned. The result never exceeds MAX_SIZE_BYTES.
+
+    Args:
+        chunk_size (int): Requested chunk size in bytes
+        optimal_io_size (int): Device optimal I/O size in bytes, 0 if
+                               not reported (CHUNK_ALIGNMENT is used)
+
+    Returns:
+        int: Aligned chunk size in bytes
+    """
+    if optimal_io_size > 0 and optimal_io_size % DIRECT_IO_ALIGNMENT == 0:
+        alignment = optimal_io_size
+    else:
+        alignment = CHUNK_ALIGNMENT
+    aligned = -(-chunk_size // alignment) * alignment
+    if aligned > MAX_SIZE_BYTES:
+        aligned = max(alignment, MAX_SIZE_BYTES // alignment * alignment)
+    return aligned
+
+
 def create_wipe_strategy(algorithm, device, size, chunk_size, written,
                          pretest_results, progress_callback):
     """
@@ -512,7 +559,8 @@ def handle_resume(device):
 
 
 def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
-                skip_pretest=False, force_buffer=False):
+                skip_pretest=False, force_buffer=False, zero_out=False,
+                secure_discard=False):
     """
     Wipe device using appropriate strategy (WRAPPER).
 
@@ -525,6 +573,10 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
         resume: Whether to resume previous session
         skip_pretest: Whether to skip HDD pretest
         force_buffer: Whether user explicitly specified buffer size
+        zero_out: Whether to zero the device with BLKZEROOUT instead of
+                  writing random data
+        secure_discard: Whether to erase the device with BLKSECDISCARD,
+                        zeroing where secure discard is unsupported
 
     Raises:
         KeyboardInterrupt: If user interrupts the wipe
@@ -534,10 +586,11 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
 
     written = 0
     size = 0
-    start_time = time.time()
+    start_time = time.monotonic()
     pretest_results = None
     device_id = None  # Initialize to None for exception handlers
     algorithm = None
+    strategy = None  # Holds the live write position once created
 
     try:
         size = DeviceDetector.get_block_device_size(device)
@@ -572,7 +625,20 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
 
         # Only determine algorithm if not already set by resume
         if not algorithm:
-            if force_buffer:
+            if secure_discard:
+                # Drive erases its mappings; no pretest or buffer tuning
+                algorithm = "secure_discard"
+                pretest_results = None
+                print(f"Using {algorithm} algorithm (BLKSECDISCARD)")
+                if disk_type == "HDD":
+                    print("⚠️  HDDs do not support secure discard; the "
+                          "device will be zeroed instead")
+            elif zero_out:
+                # Kernel zeroes the device; no pretest or buffer tuning
+                algorithm = "zero_out"
+                pretest_results = None
+                print(f"Using {algorithm} algorithm (BLKZEROOUT)")
+            elif force_buffer:
                 # User explicitly specified buffer - skip pretest
                 print(f"Using user-specified buffer: "
                       f"{chunk_size / MEGABYTE:.0f} MB")
@@ -593,27 +659,42 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
             else:
                 algorithm = "standard"
                 print(f"Using {algorithm} algorithm")
-
-        def progress_callback(written_bytes, total_bytes, chunk_bytes):
-            """Callback for saving progress from strategy."""
-            save_progress(device, written_bytes, total_bytes, chunk_bytes,
-                          pretest_results, device_id, algorithm)
-
-        strategy = WipeStrategyFactory.create_strategy(
-            algorithm=algorithm,
-            device_path=device,
-            total_size=size,
-            chunk_size=chunk_size,
-            start_position=written,
-            pretest_results=pretest_results,
-            progress_callback=progress_callback)
-
-        strategy.wipe()
+                if disk_type in FLASH_DISK_TYPES:
+                    print("   Tip: --secure-discard or --zero-out lets the "
+                          "drive erase itself, usually much faster")
+
+        aligned_chunk_size = align_chunk_size(
+            chunk_size, detector.get_optimal_io_size())
+        if aligned_chunk_size != chunk_size:
+            print(f"   Buffer rounded from {chunk_size / MEGABYTE:.2f} MB "
+                  f"to {aligned_chunk_size / MEGABYTE:.2f} MB to match the "
+                  f"device I/O size")
+            chunk_size = aligned_chunk_size
+
+        # Checkpoints are saved off the wipe loop; leaving the block waits
+        # for the last one before clearing or saving progress below
+        with ProgressWriter(save_progress) as progress_writer:
+            def progress_callback(written_bytes, total_bytes, chunk_bytes):
+                """Callback for saving progress from strategy."""
+                progress_writer.submit(device, written_bytes, total_bytes,
+                                       chunk_bytes, pretest_results,
+                                       device_id, algorithm)
+
+            strategy = WipeStrategyFactory.create_strategy(
+                algorithm=algorithm,
+                device_path=device,
+                total_size=size,
+                chunk_size=chunk_size,
+                start_position=written,
+                pretest_results=pretest_results,
+                progress_callback=progress_callback)
+
+            strategy.wipe()
         written = strategy.written
 
         clear_progress()
 
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         avg_speed = calculate_average_speed(size, total_time)
 
         print("\n" + "=" * 50)
@@ -626,9 +707,9 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
         print("• Status: Successfully wiped")
 
     except KeyboardInterrupt:
-        # Get actual progress from strategy if it was created
-        if 'strategy' in locals():
-            written = strategy.written
+        # Only data synced to the device counts as progress
+        if strategy is not None:
+            written = strategy.synced_position
         print("\n\n⚠️  Wipe interrupted by user")
         print(f"• Progress saved: {written / GIGABYTE:.2f} GB written")
         print("• To resume: sudo wipeit --resume")
@@ -637,15 +718,25 @@ def wipe_device(device, chunk_size=DEFAULT_CHUNK_SIZE, resume=False,
                       device_id, algorithm)
         sys.exit(1)
     except Exception as e:
-        # Get actual progress from strategy if it was created
-        if 'strategy' in locals():
-            written = strategy.written
+        # Only data synced to the device counts as progress
+        if strategy is not None:
+            written = strategy.synced_position
         print(f"\nError during wipe: {e}")
         save_progress(device, written, size, chunk_size, pretest_results,
                       device_id, algorithm)
         sys.exit(1)
 
 
+def handle_termination(signum, frame):
+    """
+    Turn SIGTERM into KeyboardInterrupt.
+
+    The wipe then unwinds through the interrupt handler in wipe_device(),
+    which waits for the background checkpoint and saves final progress.
+    """
+    raise KeyboardInterrupt
+
+
 def setup_argument_parser():
     """
     Set up and return the command-line argument parser.
@@ -663,7 +754,10 @@ Examples:
   wipeit --resume                   # Resume previous wipe (auto-detects drive)
   wipeit --resume /dev/sdb          # Resume on specific device (optional)
   wipeit --skip-pretest /dev/sdb    # Skip HDD pretest
+  wipeit --zero-out /dev/nvme0n1    # Zero via the drive (SSD/NVMe)
+  wipeit --secure-discard /dev/sdb  # Securely discard (SSD/NVMe/eMMC)
   wipeit --list                     # List all available devices
+  wipeit --yes /dev/sdb             # No confirmation prompt (scripts)
 
 ⚠️  WARNING: This tool will PERMANENTLY DESTROY ALL DATA on the target device!
         """
@@ -678,7 +772,7 @@ Examples:
         default='100M',
         help='Buffer size (default: 100M, range: 1M-1T). '
              'When specified, bypasses algorithm selection and uses '
-             'this exact buffer size.')
+             'this buffer size, rounded up to the device I/O size.')
     parser.add_argument('--resume', action='store_true',
                         help='Resume previous wipe session '
                              '(auto-detects drive by serial number)')
@@ -686,6 +780,19 @@ Examples:
                         help='Skip HDD pretest (use standard algorithm)')
     parser.add_argument('--list', action='store_true',
                         help='List all available block devices')
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help='Skip the final confirmation prompt '
+                             '(for scripted wipes; mounted devices are '
+                             'still refused)')
+    erase_mode = parser.add_mutually_exclusive_group()
+    erase_mode.add_argument('--zero-out', action='store_true',
+                            help='Zero the device with the BLKZEROOUT ioctl '
+                                 'instead of writing random data (fast on '
+                                 'SSD/NVMe)')
+    erase_mode.add_argument('--secure-discard', action='store_true',
+                            help='Erase flash storage with the BLKSECDISCARD '
+                                 'ioctl, zeroing instead where the drive '
+                                 'does not support it')
     parser.add_argument(
         '-v',
         '--version',
@@ -695,10 +802,13 @@ Examples:
     return parser
 
 
+# Built once at import; parse_args() leaves the parser unchanged
+_PARSER = setup_argument_parser()
+
+
 def main():
     """Main function for CLI interface."""
-    parser = setup_argument_parser()
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
 
     # Detect if user explicitly specified buffer size
     user_specified_buffer = ('-b' in sys.argv or
@@ -810,34 +920,39 @@ def main():
     # Safety check: Ensure device is not mounted
     is_mounted, mount_info = detector.is_mounted()
     if is_mounted:
-        print("\n" + "=" * 70)
-        print("🚨 SAFETY CHECK FAILED - DEVICE IS MOUNTED")
-        print("=" * DISPLAY_LINE_WIDTH)
-        print(f"Cannot proceed with wiping {args.device}")
-        print("   The device or its partitions are currently mounted!")
-        print()
+        device_name = os.path.basename(args.device)
+        lines = ["", "=" * 70,
+                 "🚨 SAFETY CHECK FAILED - DEVICE IS MOUNTED",
+                 "=" * DISPLAY_LINE_WIDTH,
+                 f"Cannot proceed with wiping {args.device}",
+                 "   The device or its partitions are currently mounted!",
+                 ""]
         if mount_info:
-            print("Mounted partitions found:")
-            for mount in mount_info:
-                print(f"   • {mount}")
-            print()
-        print("TO FIX THIS ISSUE:")
-        print("   1. Unmount all partitions on this device:")
-        print(f"      sudo umount /dev/{args.device.split('/')[-1]}*")
-        print("   2. Or unmount specific partitions:")
+            lines.append("Mounted partitions found:")
+            lines.extend(f"   • {mount}" for mount in mount_info)
+            lines.append("")
+        lines += ["TO FIX THIS ISSUE:",
+                  "   1. Unmount all partitions on this device:",
+                  f"      sudo umount /dev/{device_name}*",
+                  "   2. Or unmount specific partitions:"]
         for mount in mount_info:
-            partition = mount.split(' -> ')[0]
-            print(f"      sudo umount {partition}")
-        print("   3. Verify device is unmounted:")
-        print(f"      lsblk {args.device}")
-        print("   4. Then run wipeit again")
-        print()
-        print("⚠️  WARNING: Wiping a mounted device can cause:")
-        print("   • Data corruption on the mounted filesystem")
-        print("   • System instability or crashes")
-        print("   • Loss of data on other mounted partitions")
-        print()
-        print("Program terminated for safety.")
+            path, _, mount_point = mount.partition(' -> ')
+            if mount_point == '[SWAP]':
+                lines.append(f"      sudo swapoff {path}")
+            elif mount_point:
+                lines.append(f"      sudo umount {path}")
+        lines += ["   3. Verify device is unmounted:",
+                  f"      lsblk {args.device}",
+                  "   4. Then run wipeit again",
+                  "",
+                  "⚠️  WARNING: Wiping a mounted device can cause:",
+                  "   • Data corruption on the mounted filesystem",
+                  "   • System instability or crashes",
+                  "   • Loss of data on other mounted partitions",
+                  "",
+                  "Program terminated for safety."]
+        # One write for the whole report rather than a print per line
+        print("\n".join(lines))
         sys.exit(1)
 
     # Load progress if resuming
@@ -869,21 +984,26 @@ def main():
     print("🚨 This action CANNOT be undone!")
     print("🚨 Make sure you have selected the correct device!")
     print()
-    print("Type 'y' to proceed with wiping, or anything else to abort:")
+    if args.yes:
+        # Scripted wipe: the mount check above still applies
+        print("Confirmation skipped (--yes)")
+    else:
+        print("Type 'y' to proceed with wiping, or anything else to abort:")
 
-    try:
-        response = input().strip().lower()
-        if response != 'y':
-            print("Wipe cancelled by user")
+        try:
+            response = input().strip().lower()
+            if response != 'y':
+                print("Wipe cancelled by user")
+                sys.exit(0)
+        except KeyboardInterrupt:
+            print("\nWipe cancelled by user")
             sys.exit(0)
-    except KeyboardInterrupt:
-        print("\nWipe cancelled by user")
-        sys.exit(0)
 
-    # Start wiping
+    # Start wiping; a kill saves progress just like Ctrl+C
+    signal.signal(signal.SIGTERM, handle_termination)
     print("\n🚀 Starting secure wipe...")
     wipe_device(args.device, buffer_size, args.resume, args.skip_pretest,
-                user_specified_buffer)
+                user_specified_buffer, args.zero_out, args.secure_discard)
 
 
 if __name__ == '__main__':
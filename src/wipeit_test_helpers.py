@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures and helpers for the wipeit unit tests.
+
+Imported by the test_*.py modules; holds no tests itself.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from global_constants import (
+    PROGRESS_FILE_NAME,
+    TEST_CHUNK_SIZE_100MB,
+    TEST_TIMESTAMP_2024_01_01,
+    TEST_TOTAL_SIZE_4GB,
+    TEST_WRITTEN_1GB,
+)
+
+# Effective user IDs for run_as()
+ROOT_EUID = 0
+USER_EUID = 1000
+
+LSBLK_DISKS_SDA_SDB = b'NAME TYPE\nsda disk\nsdb disk\n'
+
+# Pre-recorded subprocess.check_output results keyed on argv
+CHECK_OUTPUT_FIXTURES = {
+    ('lsblk', '-dno', 'NAME,TYPE'): LSBLK_DISKS_SDA_SDB,
+}
+
+
+# Progress file contents shared by the resume tests; override per test
+BASE_PROGRESS = {
+    'device': '/dev/sdb',
+    'written': TEST_WRITTEN_1GB,
+    'total_size': TEST_TOTAL_SIZE_4GB,
+    'chunk_size': TEST_CHUNK_SIZE_100MB,
+    'timestamp': TEST_TIMESTAMP_2024_01_01,
+    'progress_percent': 25.0,
+}
+
+
+def make_progress(**overrides):
+    """Return a fresh copy of BASE_PROGRESS updated with overrides."""
+    return {**BASE_PROGRESS, **overrides}
+
+
+def write_progress(path, **overrides):
+    """Write make_progress(**overrides) to path as JSON.
+
+    Serialises to one bytes object and writes it with a single os.write()
+    rather than letting json.dump() issue a write per token.
+    """
+    data = json.dumps(make_progress(**overrides)).encode()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def check_output_dispatch(argv, **_kwargs):
+    """Return the recorded check_output result for argv."""
+    return CHECK_OUTPUT_FIXTURES[tuple(argv)]
+
+
+def run_as(euid):
+    """Return a patcher making os.geteuid() report euid.
+
+    Usable as a test decorator; unlike patch(..., return_value=...) it
+    does not add a mock argument to the test method.
+    """
+    return patch('os.geteuid', new=lambda: euid)
+
+
+def start_patch(testcase, patcher):
+    """Start patcher and register its stop as a cleanup on testcase.
+
+    Lets setUp() install a test's patches in one place instead of
+    stacking decorators on every test method.
+    """
+    mocked = patcher.start()
+    testcase.addCleanup(patcher.stop)
+    return mocked
+
+
+@contextlib.contextmanager
+def discard_stdout():
+    """Send stdout to os.devnull for tests that never inspect it."""
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        yield
+
+
+class TempCwdTestCase(unittest.TestCase):
+    """Base class running each test in its own temporary directory.
+
+    Progress files are written relative to the working directory, so an
+    isolated directory per test keeps tests from sharing (or leaking)
+    wipeit_progress.json.
+    """
+
+    def setUp(self):
+        """Change into a fresh temporary directory for this test."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp_dir.name)
+        self.test_progress_file = PROGRESS_FILE_NAME